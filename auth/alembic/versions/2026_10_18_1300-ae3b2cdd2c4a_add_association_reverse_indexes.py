@@ -0,0 +1,50 @@
+"""add association reverse indexes
+
+Revision ID: ae3b2cdd2c4a
+Revises: 279f8161274e
+Create Date: 2026-10-18 13:00:47.115032
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "ae3b2cdd2c4a"
+down_revision: Union[str, None] = "279f8161274e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_association_users_roles_user_id",
+            "association_users_roles",
+            ["user_id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_association_roles_permissions_permissions_id",
+            "association_roles_permissions",
+            ["permissions_id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_association_roles_permissions_permissions_id",
+            table_name="association_roles_permissions",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_association_users_roles_user_id",
+            table_name="association_users_roles",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,93 @@
+import argparse
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from uuid import uuid4
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+from src.utils.tokens import TokenSigner, TokenVerifier
+
+
+def generate_pem_keys(algorithm: str) -> tuple[str, str]:
+    if algorithm == "RS256":
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    elif algorithm == "ES256":
+        private_key = ec.generate_private_key(ec.SECP256R1())
+    else:
+        private_key = ed25519.Ed25519PrivateKey.generate()
+    private_pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode()
+    public_pem = (
+        private_key.public_key()
+        .public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        .decode()
+    )
+    return private_pem, public_pem
+
+
+def ops_per_second(func, seconds: float) -> float:
+    count = 0
+    started_at = time.perf_counter()
+    deadline = started_at + seconds
+    while time.perf_counter() < deadline:
+        func()
+        count += 1
+    return count / (time.perf_counter() - started_at)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="JWT sign/verify benchmark")
+    parser.add_argument("--seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    now = datetime.now(timezone.utc)
+    payload = {
+        "sub": "admin",
+        "roles": ["user"],
+        "user_id": str(uuid4()),
+        "exp": now + timedelta(minutes=10),
+        "iat": now,
+        "type": "access_token",
+        "jti_refresh": str(uuid4()),
+        "jti_access": str(uuid4()),
+    }
+    columns = ("sign pem", "sign key", "verify pem", "verify key", "bytes")
+    print(f"{'ops/s':<10}" + "".join(f"{column:>12}" for column in columns))
+    for algorithm in ("RS256", "ES256", "EdDSA"):
+        private_pem, public_pem = generate_pem_keys(algorithm)
+        with tempfile.TemporaryDirectory() as certs:
+            private_path = Path(certs) / "private.pem"
+            public_path = Path(certs) / "public.pem"
+            private_path.write_text(private_pem)
+            public_path.write_text(public_pem)
+            signer = TokenSigner(private_key=private_path, algorithm=algorithm)
+            verifier = TokenVerifier(public_keys={algorithm: public_path})
+        token = signer.sign(payload)
+        results = (
+            ops_per_second(
+                lambda: jwt.encode(payload, key=private_pem, algorithm=algorithm),
+                args.seconds,
+            ),
+            ops_per_second(lambda: signer.sign(payload), args.seconds),
+            ops_per_second(
+                lambda: jwt.decode(token, key=public_pem, algorithms=[algorithm]),
+                args.seconds,
+            ),
+            ops_per_second(lambda: verifier.verify(token), args.seconds),
+            len(token),
+        )
+        print(f"{algorithm:<10}" + "".join(f"{result:>12.0f}" for result in results))
+
+
+if __name__ == "__main__":
+    main()
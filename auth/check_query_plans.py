@@ -0,0 +1,181 @@
+"""
+Проверка планов горячих запросов: наполняет базу тестовыми данными внутри
+транзакции, прогоняет EXPLAIN для запросов crud и откатывает транзакцию.
+Завершается с кодом 1, если какой-то запрос читает горячую таблицу через Seq Scan.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from contextlib import contextmanager
+from random import Random
+from uuid import uuid4
+
+from sqlalchemy import event, insert, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.session import db_session
+from src.models.user import User, AssociationUsersRoles
+from src.models.permissions import (
+    Roles,
+    Permissions,
+    AssociationRolesRolePermissions,
+)
+from src.services.crud.user import (
+    get_active_user_by_username_with_roles,
+    get_user_by_uuid,
+    get_user_with_roles,
+    get_user_permission_names,
+    get_usernames_by_role,
+)
+
+HOT_TABLES = frozenset({"users", "association_users_roles"})
+
+
+@contextmanager
+def captured_statements():
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    engine = db_session.engine.sync_engine
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+
+def scans(plan: dict) -> list[tuple[str, str, str | None]]:
+    found = []
+    if "Relation Name" in plan:
+        found.append((plan["Node Type"], plan["Relation Name"], plan.get("Index Name")))
+    for child in plan.get("Plans", []):
+        found.extend(scans(child))
+    return found
+
+
+async def explain(session: AsyncSession, statement: str, parameters) -> dict:
+    conn = await session.connection()
+    result = await conn.exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {statement}", parameters
+    )
+    plan = result.scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+async def seed(session: AsyncSession, users: int, roles: int, permissions: int):
+    """
+    У всех пользователей роль user, у ~1% дополнительно одна из остальных ролей
+    """
+    rng = Random(0)
+    role_ids = [uuid4() for _ in range(roles)]
+    permission_ids = [uuid4() for _ in range(permissions)]
+    user_ids = [uuid4() for _ in range(users)]
+    await session.execute(
+        insert(Roles), [{"id": id_, "name": f"role {id_}"} for id_ in role_ids]
+    )
+    await session.execute(
+        insert(Permissions),
+        [{"id": id_, "name": f"permission {id_}"} for id_ in permission_ids],
+    )
+    role_permissions = {
+        (role_ids[0], permission_id) for permission_id in permission_ids[:4]
+    }
+    for role_id in role_ids[1:]:
+        for permission_id in rng.sample(permission_ids[4:], 2):
+            role_permissions.add((role_id, permission_id))
+    await session.execute(
+        insert(AssociationRolesRolePermissions),
+        [
+            {"role_id": role_id, "permissions_id": permission_id}
+            for role_id, permission_id in role_permissions
+        ],
+    )
+    await session.execute(
+        insert(User),
+        [
+            {
+                "id": id_,
+                "username": f"user{i}",
+                "email": f"user{i}@mail.ru",
+                "password": b"password",
+            }
+            for i, id_ in enumerate(user_ids)
+        ],
+    )
+    user_roles = [{"role_id": role_ids[0], "user_id": id_} for id_ in user_ids]
+    user_roles += [
+        {"role_id": rng.choice(role_ids[1:]), "user_id": id_}
+        for id_ in user_ids
+        if rng.random() < 0.01
+    ]
+    await session.execute(insert(AssociationUsersRoles), user_roles)
+    for table in (
+        "users",
+        "roles",
+        "permissions",
+        "association_users_roles",
+        "association_roles_permissions",
+    ):
+        await session.execute(text(f"ANALYZE {table}"))
+    sample_role_id, sample_user_id = user_roles[-1].values()
+    return sample_user_id, sample_role_id
+
+
+def hot_queries(session: AsyncSession, user_id, role_id) -> dict:
+    return {
+        "get_active_user_by_username_with_roles": lambda: (
+            get_active_user_by_username_with_roles("user1", session)
+        ),
+        "get_user_by_uuid": lambda: get_user_by_uuid(user_id, session),
+        "get_user_with_roles": lambda: get_user_with_roles(user_id, session),
+        "get_user_permission_names": lambda: get_user_permission_names(
+            session, user_id
+        ),
+        "get_usernames_by_role": lambda: get_usernames_by_role(session, role_id),
+    }
+
+
+async def main(users: int, roles: int, permissions: int) -> int:
+    failed = 0
+    async with db_session.session_factory() as session:
+        try:
+            sample = await seed(
+                session, users=users, roles=roles, permissions=permissions
+            )
+            for name, query in hot_queries(session, *sample).items():
+                with captured_statements() as statements:
+                    await query()
+                for statement, parameters in statements:
+                    plan = await explain(session, statement, parameters)
+                    for node, relation, index in scans(plan):
+                        is_seq_scan = node == "Seq Scan" and relation in HOT_TABLES
+                        print(
+                            f"{'FAIL' if is_seq_scan else 'ok':4} {name}: "
+                            f"{node} on {relation}"
+                            + (f" using {index}" if index else "")
+                        )
+                        failed += is_seq_scan
+        finally:
+            await session.rollback()
+    await db_session.engine.dispose()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=50_000)
+    parser.add_argument("--roles", type=int, default=50)
+    parser.add_argument("--permissions", type=int, default=20)
+    args = parser.parse_args()
+    sys.exit(
+        asyncio.run(
+            main(users=args.users, roles=args.roles, permissions=args.permissions)
+        )
+    )
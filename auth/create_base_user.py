@@ -6,6 +6,7 @@ from sqlalchemy.orm import selectinload
 from src.models.user import User
 from src.models.permissions import Roles
 from src.utils.auth_utils import auth_utils
+from src.utils.password_hasher import password_hasher
 from src.db.session import db_session
 
 
@@ -20,7 +21,7 @@ async def create_base_user(session: AsyncSession) -> None:
     role = await create_user_role(session)
     new_user = User(
         username="admin",
-        password=auth_utils.hash_password("admin"),
+        password=await auth_utils.hash_password_async("admin"),
         email="admin@mail.ru",
     )
     session.add(new_user)
@@ -37,6 +38,7 @@ async def create_base_user(session: AsyncSession) -> None:
 async def main() -> None:
     async with db_session.session_factory() as session:
         await create_base_user(session)
+    password_hasher.shutdown()
 
 
 if __name__ == "__main__":
@@ -1,18 +1,25 @@
+import asyncio
 import logging
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 
 import uvicorn
 from fastapi import FastAPI
 from redis.asyncio import Redis
 
 from src.db import redis
+from src.db.replicas import LsnMiddleware
+from src.db.session import db_session
 from src.utils.logger import LOGGING
+from src.utils.metrics import MetricsMiddleware
+from src.utils.password_hasher import password_hasher
 from src.core.settings import settings
+from src.api import internal, metrics
 from src.api.v1 import user, login, permissions
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    replicas_task = asyncio.create_task(db_session.monitor_replicas())
     try:
         redis.redis = Redis(
             host=settings.redis_settings.REDIS_HOST,
@@ -20,7 +27,11 @@ async def lifespan(app: FastAPI):
         )
         yield
     finally:
+        replicas_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await replicas_task
         await redis.redis.close()
+        password_hasher.shutdown()
 
 
 app = FastAPI(
@@ -29,10 +40,16 @@ app = FastAPI(
     openapi_url="/auth/api/openapi.json",
     lifespan=lifespan,
 )
+app.add_middleware(
+    LsnMiddleware, sticky_seconds=settings.db_settings.AUTH_DB_STICKY_SECONDS
+)
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(user.router, prefix="/auth/api/users", tags=["users"])
 app.include_router(login.router, prefix="/auth/api", tags=["login"])
 app.include_router(permissions.router, prefix="/auth/api/roles", tags=["roles"])
+app.include_router(internal.router, prefix="/internal", tags=["internal"])
+app.include_router(metrics.router, tags=["internal"])
 
 
 if __name__ == "__main__":
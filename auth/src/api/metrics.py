@@ -0,0 +1,67 @@
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, generate_latest
+from prometheus_client.core import (
+    CounterMetricFamily,
+    GaugeMetricFamily,
+    HistogramMetricFamily,
+)
+
+from src.db.session import db_session
+
+router = APIRouter()
+
+
+class ServiceCollector:
+    """
+    Статистика, которую сервис и так собирает: пулы соединений и реплики.
+    Читается в момент запроса /metrics
+    """
+
+    def collect(self):
+        size = GaugeMetricFamily("db_pool_size", "Размер пула", labels=["engine"])
+        checked_out = GaugeMetricFamily(
+            "db_pool_checked_out", "Выданные соединения", labels=["engine"]
+        )
+        overflow = GaugeMetricFamily(
+            "db_pool_overflow", "Соединения сверх pool_size", labels=["engine"]
+        )
+        timeouts = CounterMetricFamily(
+            "db_pool_timeouts", "Отказы по pool_timeout", labels=["engine"]
+        )
+        wait = HistogramMetricFamily(
+            "db_pool_wait_seconds", "Ожидание соединения из пула", labels=["engine"]
+        )
+        for engine, stats in db_session.pool_stats().items():
+            size.add_metric([engine], stats["size"])
+            checked_out.add_metric([engine], stats["checked_out"])
+            overflow.add_metric([engine], stats["overflow"])
+            timeouts.add_metric([engine], stats["timeouts"])
+            wait.add_metric(
+                [engine],
+                buckets=list(stats["wait_seconds"]["buckets"].items()),
+                sum_value=stats["wait_seconds"]["sum"],
+            )
+        yield from (size, checked_out, overflow, timeouts, wait)
+
+        healthy = GaugeMetricFamily(
+            "db_replica_healthy", "Реплика в ротации", labels=["replica"]
+        )
+        lag = GaugeMetricFamily(
+            "db_replica_lag_seconds", "Отставание реплики", labels=["replica"]
+        )
+        for replica in db_session.replicas_status():
+            healthy.add_metric([replica["name"]], replica["healthy"])
+            if replica["lag_seconds"] is not None:
+                lag.add_metric([replica["name"]], replica["lag_seconds"])
+        yield from (healthy, lag)
+
+
+REGISTRY.register(ServiceCollector())
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics() -> Response:
+    """
+    Метрики в формате Prometheus. Как и /internal, наружу через nginx не отдается
+    """
+    return Response(generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
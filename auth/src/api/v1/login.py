@@ -4,9 +4,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.db.redis import RedisCache, get_redis
 from src.db.session import db_session
+from src.services.principal_cache import principal_cache
 from src.services.validate_auth_user import validate_auth_user
 from src.utils.auth_utils import auth_utils
-from src.schemas.permissions import RolesSchema
 
 router = APIRouter()
 http_bearer = HTTPBearer(auto_error=True)
@@ -15,13 +15,14 @@ http_bearer = HTTPBearer(auto_error=True)
 @router.post("/login")
 async def login(
     user=Depends(validate_auth_user),
+    cache: RedisCache = Depends(get_redis),
+    session: AsyncSession = Depends(db_session.get_session),
 ) -> dict[str, str]:
-    payload = {
-        "sub": user.username,
-        "roles": [RolesSchema.model_validate(role).name for role in user.roles],
-        "user_id": str(user.id),
-    }
-    access_token, refresh_token = await auth_utils.create_jwt_token(payload=payload)
+    principal = await auth_utils.principal_from_user(user=user, session=session)
+    await principal_cache.put(principal=principal, cache=cache)
+    access_token, refresh_token = await auth_utils.create_jwt_token(
+        payload=auth_utils.token_payload(principal)
+    )
     return {
         "access_token": access_token,
         "refresh_token": refresh_token,
@@ -18,6 +18,7 @@ from src.schemas.user import (
 from src.services.crud import user as crud_user
 from src.services.crud import permissions as crud_permissions
 from src.utils.check_permissions import check_permissions
+from src.utils.responses import rows_response, total_headers
 import logging
 
 
@@ -25,6 +26,8 @@ router = APIRouter()
 
 logger = logging.getLogger(__name__)
 
+SHOW_USER_FIELDS = tuple(ShowUserSchema.model_fields)
+
 
 @router.get(
     "/",
@@ -36,8 +39,12 @@ logger = logging.getLogger(__name__)
 async def get_users(
     request: Request,
     session: AsyncSession = Depends(db_session.get_session),
-) -> list[User]:
-    return await crud_user.get_active_users(session)
+) -> Response:
+    rows = await crud_user.get_active_user_rows(session, fields=SHOW_USER_FIELDS)
+    # Список отдается целиком, поэтому итог точный и ничего не стоит
+    return rows_response(
+        rows, SHOW_USER_FIELDS, headers=total_headers(len(rows), exact=True)
+    )
 
 
 @router.post(
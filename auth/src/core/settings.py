@@ -1,4 +1,6 @@
 from pathlib import Path
+from typing import Literal
+from uuid import uuid4
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 
@@ -6,6 +8,8 @@ load_dotenv()
 
 AUTH_BASE_DIR = Path(__file__).parent.parent.parent
 
+JWTAlgorithm = Literal["RS256", "ES256", "EdDSA"]
+
 
 class DBSettings(BaseSettings):
     AUTH_DB_HOST: str = "localhost"
@@ -13,18 +17,66 @@ class DBSettings(BaseSettings):
     AUTH_DB_USER: str = "postgres"
     AUTH_DB_PASS: str = "postgres"
     AUTH_DB_NAME: str = "postgres"
+    AUTH_DB_POOL_SIZE: int = 5
+    AUTH_DB_MAX_OVERFLOW: int = 10
+    AUTH_DB_POOL_TIMEOUT: float = 30
+    AUTH_DB_POOL_RECYCLE: int = 1800
+    AUTH_DB_POOL_PRE_PING: bool = False
+    AUTH_DB_STATEMENT_CACHE_SIZE: int = 100
+    # PgBouncer в режиме transaction не сохраняет prepared statements между
+    # транзакциями, поэтому кеши выражений отключаются
+    AUTH_DB_PGBOUNCER: bool = False
+    # Реплики для чтения: "host:port,host:port", учетные данные как у primary
+    AUTH_DB_REPLICA_HOSTS: str = ""
+    AUTH_DB_REPLICA_MAX_LAG_SECONDS: float = 2
+    AUTH_DB_REPLICA_CHECK_INTERVAL_SECONDS: float = 0.5
+    # Сколько живет cookie с LSN последней записи клиента
+    AUTH_DB_STICKY_SECONDS: int = 5
 
     @property
     def auth_async_database_url(self):
         return f"postgresql+asyncpg://{self.AUTH_DB_USER}:{self.AUTH_DB_PASS}@{self.AUTH_DB_HOST}:{self.AUTH_DB_PORT}/{self.AUTH_DB_NAME}"
 
+    @property
+    def replica_database_urls(self) -> list[str]:
+        return [
+            f"postgresql+asyncpg://{self.AUTH_DB_USER}:{self.AUTH_DB_PASS}@{host.strip()}/{self.AUTH_DB_NAME}"
+            for host in self.AUTH_DB_REPLICA_HOSTS.split(",")
+            if host.strip()
+        ]
+
+    @property
+    def engine_options(self) -> dict:
+        if self.AUTH_DB_PGBOUNCER:
+            connect_args = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+            }
+        else:
+            connect_args = {
+                "prepared_statement_cache_size": self.AUTH_DB_STATEMENT_CACHE_SIZE
+            }
+        return {
+            "pool_size": self.AUTH_DB_POOL_SIZE,
+            "max_overflow": self.AUTH_DB_MAX_OVERFLOW,
+            "pool_timeout": self.AUTH_DB_POOL_TIMEOUT,
+            "pool_recycle": self.AUTH_DB_POOL_RECYCLE,
+            "pool_pre_ping": self.AUTH_DB_POOL_PRE_PING,
+            "connect_args": connect_args,
+        }
+
 
 class JWTSettings(BaseSettings):
     AUTH_PRIVATE_KEY_FILE: str
     AUTH_PUBLIC_KEY_FILE: str
-    ALGORITHM: str
+    ALGORITHM: JWTAlgorithm
+    # на время перехода на новый алгоритм продолжаем принимать токены старого
+    AUTH_PREVIOUS_PUBLIC_KEY_FILE: str | None = None
+    PREVIOUS_ALGORITHM: JWTAlgorithm | None = None
     ACCESS_TOKEN_EXPIRE_MINUTES: int
     REFRESH_TOKEN_EXPIRE_MINUTES: int
+    REVOCATION_CHECK_CACHE_MS: int = 300
 
     @property
     def jwt_private_key(self) -> Path:
@@ -34,10 +86,30 @@ class JWTSettings(BaseSettings):
     def jwt_public_key(self) -> Path:
         return AUTH_BASE_DIR / "src/core/certs" / self.AUTH_PUBLIC_KEY_FILE
 
+    @property
+    def jwt_public_keys(self) -> dict[str, Path]:
+        keys = {}
+        if self.AUTH_PREVIOUS_PUBLIC_KEY_FILE and self.PREVIOUS_ALGORITHM:
+            keys[self.PREVIOUS_ALGORITHM] = (
+                AUTH_BASE_DIR / "src/core/certs" / self.AUTH_PREVIOUS_PUBLIC_KEY_FILE
+            )
+        keys[self.ALGORITHM] = self.jwt_public_key
+        return keys
+
+
+class HashingSettings(BaseSettings):
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE_SIZE: int = 32
+    PASSWORD_HASH_EXECUTOR: Literal["thread", "process"] = "thread"
+
 
 class RedisSettings(BaseSettings):
     REDIS_HOST: str = "localhost"
     REDIS_PORT: int = 6379
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 300
+    PRINCIPAL_LOCAL_CACHE_TTL_SECONDS: float = 5
+    REVOCATION_STREAM: str = "auth:revoked"
+    REVOCATION_STREAM_MAXLEN: int = 100000
 
 
 class Settings(BaseSettings):
@@ -45,6 +117,7 @@ class Settings(BaseSettings):
     db_settings: DBSettings = DBSettings()
     jwt_settings: JWTSettings = JWTSettings()
     redis_settings: RedisSettings = RedisSettings()
+    hashing_settings: HashingSettings = HashingSettings()
 
 
 settings = Settings()
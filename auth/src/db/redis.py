@@ -1,6 +1,8 @@
 from redis.asyncio import Redis
 from abc import ABC, abstractmethod
 
+from src.utils.metrics import redis_timer
+
 redis: Redis | None = None
 
 
@@ -17,6 +19,13 @@ class AbstractCache(ABC):
         """
         pass
 
+    @abstractmethod
+    async def mget(self, keys: list[str | bytes]) -> list[str | None]:
+        """
+        Забрать данные из кеша по нескольким ключам за один запрос
+        """
+        pass
+
     @abstractmethod
     async def put(self, key: str, value: str, cache_time: int = None):
         """
@@ -24,6 +33,20 @@ class AbstractCache(ABC):
         """
         pass
 
+    @abstractmethod
+    async def put_many_and_publish(
+        self,
+        items: list[tuple[str | bytes, str | bytes, int]],
+        stream: str,
+        events: list[dict],
+        maxlen: int,
+    ):
+        """
+        Положить несколько значений (ключ, значение, время жизни) и добавить
+        события в поток за один запрос
+        """
+        pass
+
     @abstractmethod
     async def sadd(self, key: str, value: str):
         """
@@ -46,9 +69,9 @@ class AbstractCache(ABC):
         pass
 
     @abstractmethod
-    async def delete(self, key: str) -> set:
+    async def delete(self, *keys: str) -> set:
         """
-        Удаляет по ключу объект из кеша
+        Удаляет по ключам объекты из кеша
         """
         pass
 
@@ -58,23 +81,49 @@ class RedisCache(AbstractCache):
         self.cache = cache
 
     async def get(self, key: str) -> str:
-        return await self.cache.get(key)
+        with redis_timer("get"):
+            return await self.cache.get(key)
+
+    async def mget(self, keys: list[str | bytes]) -> list[str | None]:
+        with redis_timer("mget"):
+            return await self.cache.mget(keys)
 
     async def put(self, key: str, value: str, cache_time: int = None):
-        await self.cache.set(key, value, cache_time)
-        return await self.cache.get(key)
+        with redis_timer("put"):
+            return await self.cache.set(key, value, cache_time)
+
+    async def put_many_and_publish(
+        self,
+        items: list[tuple[str | bytes, str | bytes, int]],
+        stream: str,
+        events: list[dict],
+        maxlen: int,
+    ):
+        if not items and not events:
+            return
+        with redis_timer("put_many_and_publish"):
+            async with self.cache.pipeline(transaction=False) as pipe:
+                for key, value, cache_time in items:
+                    pipe.set(key, value, ex=cache_time)
+                for event in events:
+                    pipe.xadd(stream, event, maxlen=maxlen, approximate=True)
+                await pipe.execute()
 
     async def sadd(self, key: str, value: str):
-        await self.cache.sadd(key, value)
+        with redis_timer("sadd"):
+            await self.cache.sadd(key, value)
 
     async def srem(self, key: str, value: str):
-        await self.cache.srem(key, value)
+        with redis_timer("srem"):
+            await self.cache.srem(key, value)
 
     async def smembers(self, key: str) -> set:
-        return await self.cache.smembers(key)
+        with redis_timer("smembers"):
+            return await self.cache.smembers(key)
 
-    async def delete(self, key: str):
-        await self.cache.delete(key)
+    async def delete(self, *keys: str):
+        with redis_timer("delete"):
+            await self.cache.delete(*keys)
 
     async def close(self):
         await self.cache.close()
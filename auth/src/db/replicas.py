@@ -0,0 +1,172 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from contextvars import ContextVar
+
+from sqlalchemy import event, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import ORMExecuteState, Session
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+LSN_COOKIE = "db_lsn"
+LSN_HEADER = "X-DB-LSN"
+WROTE = "wrote"
+
+# LSN на время запроса: "seen" - до какого LSN клиент уже видел свои записи,
+# "wrote" - в запросе закоммичена запись, "written" - LSN после нее
+request_lsn: ContextVar[dict | None] = ContextVar("request_lsn", default=None)
+
+REPLICA_LSN = text(
+    "SELECT (CASE WHEN pg_is_in_recovery() THEN pg_last_wal_replay_lsn() "
+    "ELSE pg_current_wal_lsn() END)::text"
+)
+
+
+def parse_lsn(value: str) -> int:
+    high, low = value.split("/")
+    return (int(high, 16) << 32) + int(low, 16)
+
+
+class WriteTrackingSession(Session):
+    """
+    Отмечает в info, что текущая транзакция что-то записала
+    """
+
+
+@event.listens_for(WriteTrackingSession, "after_flush")
+def mark_flush(session: Session, flush_context) -> None:
+    session.info[WROTE] = True
+
+
+@event.listens_for(WriteTrackingSession, "do_orm_execute")
+def mark_dml(orm_execute_state: ORMExecuteState) -> None:
+    if (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        orm_execute_state.session.info[WROTE] = True
+
+
+class LsnTrackingSession(AsyncSession):
+    """
+    Сессия primary: коммит транзакции с записью отмечается в состоянии запроса.
+    LSN читается один раз в конце запроса, а не после каждого коммита
+    """
+
+    sync_session_class = WriteTrackingSession
+
+    async def commit(self) -> None:
+        await super().commit()
+        state = request_lsn.get()
+        if self.info.pop(WROTE, False) and state is not None:
+            state["wrote"] = True
+
+    async def rollback(self) -> None:
+        self.info.pop(WROTE, None)
+        await super().rollback()
+
+    async def remember_written_lsn(self) -> None:
+        """
+        Сохраняет LSN primary для ответа клиенту, если в запросе была запись.
+        Вызывается после всех коммитов, поэтому LSN не меньше последнего из них
+        """
+        state = request_lsn.get()
+        if state is not None and state["wrote"]:
+            state["written"] = await self.scalar(
+                text("SELECT pg_current_wal_lsn()::text")
+            )
+
+
+class Replica:
+    def __init__(self, name: str, engine: AsyncEngine) -> None:
+        self.name = name
+        self.engine = engine
+        self.session_factory = async_sessionmaker(
+            bind=engine,
+            autoflush=False,
+            autocommit=False,
+            expire_on_commit=False,
+        )
+        self.healthy = False
+        self.replay_lsn = 0
+        self.lag: float | None = None
+
+    async def check(
+        self, primary_lsns: deque[tuple[float, int]], max_lag: float, timeout: float
+    ) -> None:
+        """
+        Отставание - сколько прошло с момента, когда primary был на LSN, который
+        реплика уже применила. Так отставание растет и у реплики, потерявшей
+        связь с primary
+        """
+        try:
+            async with asyncio.timeout(timeout):
+                async with self.engine.connect() as conn:
+                    self.replay_lsn = parse_lsn(await conn.scalar(REPLICA_LSN))
+        except (TimeoutError, OSError, SQLAlchemyError) as e:
+            if self.healthy:
+                logger.warning("Replica %s is unavailable: %s", self.name, e)
+            self.healthy, self.lag = False, None
+            return
+        caught_up = [at for at, lsn in primary_lsns if lsn <= self.replay_lsn]
+        self.lag = time.monotonic() - caught_up[-1] if caught_up else None
+        healthy = self.lag is not None and self.lag <= max_lag
+        if healthy != self.healthy:
+            logger.warning(
+                "Replica %s is %s, lag %s",
+                self.name,
+                "back" if healthy else "lagging",
+                self.lag,
+            )
+        self.healthy = healthy
+
+    def status(self) -> dict:
+        return {"name": self.name, "healthy": self.healthy, "lag_seconds": self.lag}
+
+
+class LsnMiddleware:
+    """
+    Read-your-writes для реплик: LSN своей последней записи клиент приносит
+    в cookie или заголовке X-DB-LSN. Пока ни одна реплика его не применила,
+    чтения этого клиента идут в primary. Cookie живет sticky_seconds
+    """
+
+    def __init__(self, app: ASGIApp, sticky_seconds: int) -> None:
+        self.app = app
+        self.sticky_seconds = sticky_seconds
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        connection = HTTPConnection(scope)
+        seen = connection.headers.get(LSN_HEADER) or connection.cookies.get(LSN_COOKIE)
+        try:
+            state = {"seen": parse_lsn(seen) if seen else 0}
+        except ValueError:
+            state = {"seen": 0}
+        state.update(wrote=False, written=None)
+
+        async def send_with_lsn(message: Message) -> None:
+            if message["type"] == "http.response.start" and state["written"]:
+                headers = MutableHeaders(scope=message)
+                headers.append(LSN_HEADER, state["written"])
+                headers.append(
+                    "Set-Cookie",
+                    f"{LSN_COOKIE}={state['written']}; Max-Age={self.sticky_seconds}; "
+                    "Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        token = request_lsn.set(state)
+        try:
+            await self.app(scope, receive, send_with_lsn)
+        finally:
+            request_lsn.reset(token)
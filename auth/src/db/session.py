@@ -1,26 +1,165 @@
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from typing import Awaitable, Callable, Sequence
+
+from fastapi import Request
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from src.core.settings import settings
+from src.db.pool import InstrumentedPool
+from src.db.replicas import LsnTrackingSession, Replica, parse_lsn, request_lsn
+from src.utils.metrics import instrument_engine
+
+logger = logging.getLogger(__name__)
+
+db_settings = settings.db_settings
+
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
 
 
 class DatabaseHelper:
-    def __init__(self, db_url) -> None:
+    def __init__(
+        self,
+        db_url,
+        replica_urls: Sequence[str] = (),
+        max_replica_lag: float = 2,
+        replica_check_interval: float = 0.5,
+        **engine_options,
+    ) -> None:
         self.engine = create_async_engine(
             url=db_url,
             echo=False,
+            poolclass=InstrumentedPool,
+            **engine_options,
         )
         self.session_factory = async_sessionmaker(
             bind=self.engine,
+            class_=LsnTrackingSession if replica_urls else AsyncSession,
             autoflush=False,
             autocommit=False,
             expire_on_commit=False,
         )
+        self.replicas = [
+            Replica(
+                name=f"replica-{number}",
+                engine=create_async_engine(
+                    url=url,
+                    echo=False,
+                    poolclass=InstrumentedPool,
+                    **engine_options,
+                ),
+            )
+            for number, url in enumerate(replica_urls, start=1)
+        ]
+        instrument_engine(self.engine, "primary")
+        for replica in self.replicas:
+            instrument_engine(replica.engine, replica.name)
+        self.max_replica_lag = max_replica_lag
+        self.replica_check_interval = replica_check_interval
+        # (время, LSN primary) за последние max_replica_lag секунд с запасом
+        self._primary_lsns: deque[tuple[float, int]] = deque(
+            maxlen=int(max_replica_lag / replica_check_interval) + 2
+        )
+        self._delayed: set[asyncio.Task] = set()
+
+    async def get_session(self, request: Request) -> AsyncSession:
+        """
+        Сессия для обработчика: чтения (GET) - на реплику, остальное - в primary
+        """
+        if request.method in READ_METHODS:
+            session_factory = self.read_session_factory()
+        else:
+            session_factory = self.session_factory
+        async with session_factory() as session:
+            yield session
+            if isinstance(session, LsnTrackingSession):
+                await session.remember_written_lsn()
+            await session.close()
 
-    async def get_session(self) -> AsyncSession:
-        async with self.session_factory() as session:
+    async def get_read_session(self) -> AsyncSession:
+        """
+        Сессия на реплике для читающих обработчиков с другим методом (POST /batch)
+        """
+        async with self.read_session_factory()() as session:
             yield session
             await session.close()
 
+    def read_session_factory(self) -> async_sessionmaker:
+        """
+        Случайная здоровая реплика, уже применившая последнюю запись клиента;
+        если таких нет - primary
+        """
+        state = request_lsn.get()
+        seen = state["seen"] if state else 0
+        replicas = [
+            replica
+            for replica in self.replicas
+            if replica.healthy and replica.replay_lsn >= seen
+        ]
+        if not replicas:
+            return self.session_factory
+        return random.choice(replicas).session_factory
+
+    async def check_replicas(self) -> None:
+        try:
+            async with self.engine.connect() as conn:
+                lsn = await conn.scalar(text("SELECT pg_current_wal_lsn()::text"))
+        except (OSError, SQLAlchemyError) as e:
+            logger.warning("Primary is unavailable for replica checks: %s", e)
+        else:
+            self._primary_lsns.append((time.monotonic(), parse_lsn(lsn)))
+        await asyncio.gather(
+            *(
+                replica.check(
+                    self._primary_lsns,
+                    max_lag=self.max_replica_lag,
+                    timeout=self.replica_check_interval,
+                )
+                for replica in self.replicas
+            )
+        )
+
+    async def monitor_replicas(self) -> None:
+        while self.replicas:
+            await self.check_replicas()
+            await asyncio.sleep(self.replica_check_interval)
+
+    def after_replication(self, callback: Callable[[], Awaitable]) -> None:
+        """
+        Повторно выполнить callback, когда реплики гарантированно применят
+        текущие записи: так сбрасывают кеши, которые могли заново заполниться
+        чтением с отстающей реплики. Нужно и без реплик: чтение, начатое до
+        коммита, может положить в кеш старые данные уже после первого сброса
+        """
+        async def delayed() -> None:
+            await asyncio.sleep(self.max_replica_lag + self.replica_check_interval)
+            await callback()
+
+        task = asyncio.create_task(delayed())
+        self._delayed.add(task)
+        task.add_done_callback(self._delayed.discard)
+
+    def pool_stats(self) -> dict:
+        return {
+            "primary": self.engine.pool.stats.snapshot(self.engine.pool),
+            **{
+                replica.name: replica.engine.pool.stats.snapshot(replica.engine.pool)
+                for replica in self.replicas
+            },
+        }
+
+    def replicas_status(self) -> list[dict]:
+        return [replica.status() for replica in self.replicas]
+
 
 db_session: DatabaseHelper = DatabaseHelper(
-    settings.db_settings.auth_async_database_url
+    db_settings.auth_async_database_url,
+    replica_urls=db_settings.replica_database_urls,
+    max_replica_lag=db_settings.AUTH_DB_REPLICA_MAX_LAG_SECONDS,
+    replica_check_interval=db_settings.AUTH_DB_REPLICA_CHECK_INTERVAL_SECONDS,
+    **db_settings.engine_options,
 )
@@ -40,7 +40,9 @@ class AssociationRolesRolePermissions(Base):
     )
     id: Mapped[int] = mapped_column(primary_key=True)
     role_id: Mapped[UUID] = mapped_column(ForeignKey("roles.id"))
-    permissions_id: Mapped[UUID] = mapped_column(ForeignKey("permissions.id"))
+    permissions_id: Mapped[UUID] = mapped_column(
+        ForeignKey("permissions.id"), index=True
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         server_default=func.now(),
@@ -34,7 +34,7 @@ class AssociationUsersRoles(Base):
     )
     id: Mapped[int] = mapped_column(primary_key=True)
     role_id: Mapped[UUID] = mapped_column(ForeignKey("roles.id"))
-    user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id"))
+    user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id"), index=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         server_default=func.now(),
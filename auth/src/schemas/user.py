@@ -41,3 +41,11 @@ class UserLoginSchema(BaseSchema):
 
 class AddRoleToUserSchema(BaseSchema):
     role_id: UUID
+
+
+class PrincipalSchema(BaseSchema):
+    id: UUID
+    username: str
+    is_active: bool
+    roles: list[str]
+    permissions: int = 0
@@ -1,7 +1,7 @@
 from datetime import datetime, timezone
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import insert, select
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -18,18 +18,23 @@ from src.schemas.permissions import (
 )
 from src.schemas.user import AddRoleToUserSchema
 from src.utils.raising_http_excp import RaiseHttpException
-from src.services.crud.user import get_user_with_roles
+from src.services.crud.user import (
+    get_user_with_roles,
+    get_usernames_by_role,
+    get_usernames_by_permission,
+)
+from src.services.principal_cache import principal_cache
 
 
 async def create_role(
     session: AsyncSession,
     role_schema: CreateRolesSchema,
 ) -> Roles:
-    new_role = Roles(**role_schema.model_dump())
     try:
-        session.add(new_role)
+        new_role = await session.scalar(
+            insert(Roles).values(**role_schema.model_dump()).returning(Roles)
+        )
         await session.commit()
-        await session.refresh(new_role)
     except IntegrityError as e:
         if "name" in str(e.orig):
             raise HTTPException(
@@ -74,6 +79,9 @@ async def update_role(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Role with this name already exists",
             )
+    await principal_cache.invalidate(
+        *await get_usernames_by_role(session=session, role_id=role_id)
+    )
     return role
 
 
@@ -84,17 +92,22 @@ async def delete_role(
     role = await get_role(session=session, role_id=role_id)
     role.deleted_at = datetime.now(timezone.utc)
     await session.commit()
+    await principal_cache.invalidate(
+        *await get_usernames_by_role(session=session, role_id=role_id)
+    )
 
 
 async def create_permission(
     session: AsyncSession,
     role_permission_schema: CreatePermissionSchema,
 ) -> Permissions:
-    new_permission = Permissions(**role_permission_schema.model_dump())
     try:
-        session.add(new_permission)
+        new_permission = await session.scalar(
+            insert(Permissions)
+            .values(**role_permission_schema.model_dump())
+            .returning(Permissions)
+        )
         await session.commit()
-        await session.refresh(new_permission)
     except IntegrityError as e:
         if "name" in str(e.orig):
             raise HTTPException(
@@ -143,6 +156,11 @@ async def update_permission(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Permission with this name already exists",
             )
+    await principal_cache.invalidate(
+        *await get_usernames_by_permission(
+            session=session, permission_id=permission_id
+        )
+    )
     return permission
 
 
@@ -153,6 +171,11 @@ async def delete_permission(
     permission = await get_permission(session=session, permission_id=permission_id)
     permission.deleted_at = datetime.now(timezone.utc)
     await session.commit()
+    await principal_cache.invalidate(
+        *await get_usernames_by_permission(
+            session=session, permission_id=permission_id
+        )
+    )
 
 
 async def add_permission_to_role(
@@ -169,6 +192,9 @@ async def add_permission_to_role(
         permission = await get_permission(session=session, permission_id=permission_id)
         role.role_permissions.append(permission)
     await session.commit()
+    await principal_cache.invalidate(
+        *await get_usernames_by_role(session=session, role_id=role_id)
+    )
 
 
 async def get_role_permissions(
@@ -198,3 +224,4 @@ async def add_role_to_user(
     role = await get_role(session=session, role_id=role_id.role_id)
     user.roles.append(role)
     await session.commit()
+    await principal_cache.invalidate(user.username)
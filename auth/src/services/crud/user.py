@@ -1,22 +1,27 @@
 from datetime import datetime, timezone
-from typing import Annotated
+from typing import Annotated, Sequence
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import Row, insert, select
 from sqlalchemy.orm import load_only, selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status, Path, Depends
 
 from src.db.session import db_session
-from src.models.user import User
-from src.models.permissions import Roles
+from src.models.user import User, AssociationUsersRoles
+from src.models.permissions import (
+    Roles,
+    Permissions,
+    AssociationRolesRolePermissions,
+)
 
 from src.schemas.user import (
     CreateUserSchema,
     UpdateUserSchema,
     ParticularUpdateUserSchema,
 )
+from src.services.principal_cache import principal_cache
 from src.utils import auth_utils
 from src.utils.raising_http_excp import RaiseHttpException
 
@@ -25,15 +30,14 @@ async def create_user(
     user: CreateUserSchema,
     session: AsyncSession,
 ) -> User:
-    new_user = User(
-        username=user.username,
-        password=auth_utils.auth_utils.hash_password(user.password),
-        email=user.email,
-    )
+    password = await auth_utils.auth_utils.hash_password_async(user.password)
     try:
-        session.add(new_user)
+        new_user = await session.scalar(
+            insert(User)
+            .values(username=user.username, password=password, email=user.email)
+            .returning(User)
+        )
         await session.commit()
-        await session.refresh(new_user)
     except IntegrityError as e:
         await session.rollback()
         if "email" in str(e.orig):
@@ -98,6 +102,17 @@ async def get_active_users(session: AsyncSession) -> list[User]:
     return list(users)
 
 
+async def get_active_user_rows(
+    session: AsyncSession, fields: Sequence[str]
+) -> list[Row]:
+    rows = await session.execute(
+        select(*(getattr(User, field) for field in fields)).where(
+            User.is_active == True, User.deleted_at.is_(None)
+        )
+    )
+    return list(rows)
+
+
 async def get_all_users(session: AsyncSession) -> list[User]:
     users = await session.scalars(select(User).where(User.deleted_at.is_(None)))
     return list(users)
@@ -112,6 +127,8 @@ async def get_user_with_roles(
         .options(
             load_only(
                 User.id,
+                User.username,
+                User.email,
                 User.is_active,
                 User.deleted_at,
             ),
@@ -132,6 +149,7 @@ async def update_user(
     particular: bool = False,
 ) -> User:
     user = await get_active_user_by_uuid(user_id=user_id, session=session)
+    username = user.username
     for key, value in user_schema.model_dump(exclude_unset=particular).items():
         setattr(user, key, value)
     try:
@@ -153,6 +171,7 @@ async def update_user(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Duplicate entry for unique field",
             )
+    await principal_cache.invalidate(username)
     return user
 
 
@@ -161,3 +180,51 @@ async def delete_user(session: AsyncSession, user_id: UUID) -> None:
     user.is_active = False
     user.deleted_at = datetime.now(timezone.utc)
     await session.commit()
+    await principal_cache.invalidate(user.username)
+
+
+async def get_usernames_by_role(session: AsyncSession, role_id: UUID) -> list[str]:
+    usernames = await session.scalars(
+        select(User.username)
+        .join(AssociationUsersRoles, AssociationUsersRoles.user_id == User.id)
+        .where(AssociationUsersRoles.role_id == role_id)
+    )
+    return list(usernames)
+
+
+async def get_usernames_by_permission(
+    session: AsyncSession, permission_id: UUID
+) -> list[str]:
+    usernames = await session.scalars(
+        select(User.username)
+        .distinct()
+        .join(AssociationUsersRoles, AssociationUsersRoles.user_id == User.id)
+        .join(
+            AssociationRolesRolePermissions,
+            AssociationRolesRolePermissions.role_id == AssociationUsersRoles.role_id,
+        )
+        .where(AssociationRolesRolePermissions.permissions_id == permission_id)
+    )
+    return list(usernames)
+
+
+async def get_user_permission_names(session: AsyncSession, user_id: UUID) -> list[str]:
+    names = await session.scalars(
+        select(Permissions.name)
+        .distinct()
+        .join(
+            AssociationRolesRolePermissions,
+            AssociationRolesRolePermissions.permissions_id == Permissions.id,
+        )
+        .join(
+            AssociationUsersRoles,
+            AssociationUsersRoles.role_id == AssociationRolesRolePermissions.role_id,
+        )
+        .join(Roles, Roles.id == AssociationUsersRoles.role_id)
+        .where(
+            AssociationUsersRoles.user_id == user_id,
+            Roles.deleted_at.is_(None),
+            Permissions.deleted_at.is_(None),
+        )
+    )
+    return list(names)
@@ -0,0 +1,73 @@
+import time
+from collections import OrderedDict
+
+from src.core.permissions_registry import PERMISSIONS_REGISTRY_VERSION
+from src.core.settings import settings
+from src.db.redis import RedisCache, get_redis
+from src.schemas.user import PrincipalSchema
+
+redis_settings = settings.redis_settings
+
+
+class PrincipalCache:
+    """
+    Двухуровневый кеш принципалов: L1 в памяти процесса, L2 в Redis.
+    L1 живет несколько секунд, так как его нельзя сбросить в соседних процессах
+    """
+
+    def __init__(self, local_ttl: float, redis_ttl: int, maxsize: int = 10000):
+        self._local_ttl = local_ttl
+        self._redis_ttl = redis_ttl
+        self._maxsize = maxsize
+        self._local: OrderedDict[str, tuple[float, PrincipalSchema]] = OrderedDict()
+
+    @staticmethod
+    def _key(username: str) -> str:
+        return f"principal:v{PERMISSIONS_REGISTRY_VERSION}:{username}"
+
+    def _put_local(self, principal: PrincipalSchema) -> None:
+        if self._local_ttl <= 0:
+            return
+        self._local[principal.username] = (
+            time.monotonic() + self._local_ttl,
+            principal,
+        )
+        self._local.move_to_end(principal.username)
+        while len(self._local) > self._maxsize:
+            self._local.popitem(last=False)
+
+    async def get(self, username: str, cache: RedisCache) -> PrincipalSchema | None:
+        item = self._local.get(username)
+        if item is not None:
+            expires_at, principal = item
+            if expires_at > time.monotonic():
+                return principal
+            del self._local[username]
+        raw = await cache.get(self._key(username))
+        if raw is None:
+            return None
+        principal = PrincipalSchema.model_validate_json(raw)
+        self._put_local(principal)
+        return principal
+
+    async def put(self, principal: PrincipalSchema, cache: RedisCache) -> None:
+        await cache.put(
+            key=self._key(principal.username),
+            value=principal.model_dump_json(),
+            cache_time=self._redis_ttl,
+        )
+        self._put_local(principal)
+
+    async def invalidate(self, *usernames: str) -> None:
+        if not usernames:
+            return
+        for username in usernames:
+            self._local.pop(username, None)
+        cache = await get_redis()
+        await cache.delete(*[self._key(username) for username in usernames])
+
+
+principal_cache = PrincipalCache(
+    local_ttl=redis_settings.PRINCIPAL_LOCAL_CACHE_TTL_SECONDS,
+    redis_ttl=redis_settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
@@ -25,6 +25,8 @@ async def validate_auth_user(
     )
     if not user:
         raise unauthed_exception
-    if not (auth_utils.check_password(login_user.password, user.password)):
+    if not (
+        await auth_utils.check_password_async(login_user.password, user.password)
+    ):
         raise unauthed_exception
     return user
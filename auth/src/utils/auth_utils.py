@@ -1,8 +1,12 @@
 from datetime import timedelta, datetime, timezone
-from uuid import uuid4
+from uuid import UUID, uuid4
 
 import bcrypt
 import jwt
+from src.core.permissions_registry import (
+    PERMISSIONS_REGISTRY_VERSION,
+    compile_permissions,
+)
 from src.core.settings import settings
 from src.db.redis import RedisCache, get_redis
 from fastapi import HTTPException, status, Depends
@@ -12,10 +16,28 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models import User
 from src.schemas.permissions import RolesSchema
+from src.schemas.user import PrincipalSchema
 from src.services.crud import user as crud_user
+from src.services.principal_cache import principal_cache
+from src.utils.password_hasher import password_hasher
+from src.utils.token_cache import NotRevokedCache
+from src.utils.tokens import TokenSigner, TokenVerifier
 
 jwt_settings = settings.jwt_settings
+redis_settings = settings.redis_settings
 http_bearer = HTTPBearer(auto_error=True)
+not_revoked_tokens = NotRevokedCache(
+    ttl_seconds=jwt_settings.REVOCATION_CHECK_CACHE_MS / 1000
+)
+
+token_signer = TokenSigner(
+    private_key=jwt_settings.jwt_private_key, algorithm=jwt_settings.ALGORITHM
+)
+token_verifier = TokenVerifier(public_keys=jwt_settings.jwt_public_keys)
+
+
+def revoked_key(jti: str) -> bytes:
+    return b"bl:" + UUID(jti).bytes
 
 
 class AuthUtils:
@@ -23,8 +45,7 @@ class AuthUtils:
     @staticmethod
     async def create_jwt_token(
         payload: dict,
-        key: str = jwt_settings.jwt_private_key.read_text(),
-        algorithm: str = jwt_settings.ALGORITHM,
+        signer: TokenSigner = token_signer,
         access_expire_minutes: int = jwt_settings.ACCESS_TOKEN_EXPIRE_MINUTES,
         refresh_expire_minutes: int = jwt_settings.REFRESH_TOKEN_EXPIRE_MINUTES,
         access_expires_delta: timedelta | None = None,
@@ -34,6 +55,8 @@ class AuthUtils:
         refresh_payload = payload.copy()
         refresh_payload.pop("roles")
         refresh_payload.pop("user_id")
+        refresh_payload.pop("perms", None)
+        refresh_payload.pop("pv", None)
 
         now = datetime.now(timezone.utc)
         jti_refresh = str(uuid4())
@@ -43,13 +66,13 @@ class AuthUtils:
             exp = now + access_expires_delta
         else:
             exp = now + timedelta(minutes=access_expire_minutes)
-            access_payload.update(
-                exp=exp,
-                iat=now,
-                type="access_token",
-                jti_refresh=jti_refresh,
-                jti_access=jti_access,
-            )
+        access_payload.update(
+            exp=exp,
+            iat=now,
+            type="access_token",
+            jti_refresh=jti_refresh,
+            jti_access=jti_access,
+        )
 
         if refresh_expires_delta:
             exp = now + refresh_expires_delta
@@ -63,15 +86,8 @@ class AuthUtils:
             jti_access=jti_access,
         )
 
-        access_token = jwt.encode(
-            payload=access_payload,
-            key=key,
-            algorithm=algorithm,
-        )
-        refresh_token = jwt.encode(
-            payload=refresh_payload,
-            key=key,
-            algorithm=algorithm,
+        access_token, refresh_token = signer.sign_many(
+            [access_payload, refresh_payload]
         )
         return access_token, refresh_token
 
@@ -81,51 +97,47 @@ class AuthUtils:
         cache: RedisCache,
         session: AsyncSession,
     ) -> tuple[str, str]:
-        decoded_token = await AuthUtils.decode_token(token=token, cache=cache)
+        decoded_token = await AuthUtils.decode_token(
+            token=token, cache=cache, use_local_cache=False
+        )
         if decoded_token["type"] != "refresh_token":
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Token not refresh",
             )
-        if await cache.get(decoded_token["jti_refresh"]):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN, detail="Token is in black list"
-            )
         await AuthUtils.logout(token=token, cache=cache)
-        user: User = await crud_user.get_active_user_by_username_with_roles(
-            username=decoded_token["sub"], session=session
+        user = await AuthUtils.get_principal(
+            username=decoded_token["sub"], session=session, cache=cache
+        )
+        return await AuthUtils.create_jwt_token(
+            payload=AuthUtils.token_payload(user)
         )
-        payload = {
-            "sub": user.username,
-            "roles": [RolesSchema.model_validate(role).name for role in user.roles],
-            "user_id": str(user.id),
-        }
-        return await AuthUtils.create_jwt_token(payload=payload)
 
     @staticmethod
     async def decode_token(
         cache: RedisCache,
         token: str | bytes,
-        key: str = jwt_settings.jwt_public_key.read_text(),
-        algorithm: str = jwt_settings.ALGORITHM,
+        verifier: TokenVerifier = token_verifier,
+        use_local_cache: bool = True,
     ) -> dict:
         try:
-            encode = jwt.decode(
-                jwt=token,
-                key=key,
-                algorithms=[algorithm],
-            )
-            if await cache.get(encode["jti_access"]) or await cache.get(
-                encode["jti_refresh"]
-            ):
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="Token is in black list",
-                )
+            encode = verifier.verify(token)
         except jwt.InvalidTokenError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
             )
+        jti_pair = (encode["jti_access"], encode["jti_refresh"])
+        if use_local_cache and not_revoked_tokens.contains(jti_pair):
+            return encode
+        keys = [revoked_key(jti) for jti in jti_pair]
+        # ключи старого формата (строковый jti), записанные до перехода на бинарные
+        keys.extend(jti_pair)
+        if any(await cache.mget(keys)):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Token is in black list",
+            )
+        not_revoked_tokens.add(jti_pair)
         return encode
 
     @staticmethod
@@ -136,20 +148,67 @@ class AuthUtils:
     def check_password(password: str, hashed_password: bytes) -> bool:
         return bcrypt.checkpw(password.encode("utf-8"), hashed_password)
 
+    @staticmethod
+    async def hash_password_async(password: str) -> bytes:
+        return await password_hasher.hash_password(password)
+
+    @staticmethod
+    async def check_password_async(password: str, hashed_password: bytes) -> bool:
+        return await password_hasher.check_password(password, hashed_password)
+
+    @staticmethod
+    async def get_principal(
+        username: str,
+        session: AsyncSession,
+        cache: RedisCache,
+    ) -> PrincipalSchema:
+        principal = await principal_cache.get(username=username, cache=cache)
+        if principal is not None:
+            return principal
+        user: User = await crud_user.get_active_user_by_username_with_roles(
+            username=username, session=session
+        )
+        principal = await AuthUtils.principal_from_user(user=user, session=session)
+        await principal_cache.put(principal=principal, cache=cache)
+        return principal
+
+    @staticmethod
+    async def principal_from_user(user: User, session: AsyncSession) -> PrincipalSchema:
+        permission_names = await crud_user.get_user_permission_names(
+            session=session, user_id=user.id
+        )
+        return PrincipalSchema(
+            id=user.id,
+            username=user.username,
+            is_active=user.is_active,
+            roles=[RolesSchema.model_validate(role).name for role in user.roles],
+            permissions=compile_permissions(permission_names),
+        )
+
+    @staticmethod
+    def token_payload(principal: PrincipalSchema) -> dict:
+        return {
+            "sub": principal.username,
+            "roles": principal.roles,
+            "user_id": str(principal.id),
+            "perms": principal.permissions,
+            "pv": PERMISSIONS_REGISTRY_VERSION,
+        }
+
     @staticmethod
     async def get_current_active_user(
         session: AsyncSession = Depends(db_session.get_session),
         token: HTTPAuthorizationCredentials = Depends(http_bearer),
         cache: RedisCache = Depends(get_redis),
-    ) -> User:
+    ) -> PrincipalSchema:
         payload = await AuthUtils.decode_token(token=token.credentials, cache=cache)
         if payload["type"] != "access_token":
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Token not access",
             )
-        user = await crud_user.get_active_user_by_username_with_roles(
-            username=payload["sub"], session=session
+        user = await AuthUtils.get_principal(
+            username=payload["sub"], session=session, cache=cache
         )
         if user:
             return user
@@ -164,22 +223,34 @@ class AuthUtils:
         token: str,
     ) -> None:
         payload = await AuthUtils.decode_token(token=token, cache=cache)
-        refresh_cache_ttl = timedelta(
-            minutes=jwt_settings.REFRESH_TOKEN_EXPIRE_MINUTES
-        ) + timedelta(minutes=1)
-        access_cache_ttl = timedelta(
-            minutes=jwt_settings.ACCESS_TOKEN_EXPIRE_MINUTES
-        ) + timedelta(minutes=1)
-        await cache.put(
-            key=payload["jti_refresh"],
-            value=payload["sub"],
-            cache_time=int(refresh_cache_ttl.total_seconds()),
-        )
-        await cache.put(
-            key=payload["jti_access"],
-            value=payload["sub"],
-            cache_time=int(access_cache_ttl.total_seconds()),
+        # access и refresh выпускаются вместе, поэтому exp парного токена
+        # восстанавливается из общего iat
+        expirations = {
+            "access_token": payload["iat"]
+            + jwt_settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+            "refresh_token": payload["iat"]
+            + jwt_settings.REFRESH_TOKEN_EXPIRE_MINUTES * 60,
+        }
+        expirations[payload["type"]] = payload["exp"]
+        now = int(datetime.now(timezone.utc).timestamp())
+        items = []
+        events = []
+        for jti, exp in (
+            (payload["jti_access"], expirations["access_token"]),
+            (payload["jti_refresh"], expirations["refresh_token"]),
+        ):
+            cache_time = exp - now + 1
+            if cache_time > 0:
+                items.append((revoked_key(jti), b"1", cache_time))
+                events.append({"jti": jti, "exp": exp})
+        # события отзыва читают сервисы movies и comments
+        await cache.put_many_and_publish(
+            items=items,
+            stream=redis_settings.REVOCATION_STREAM,
+            events=events,
+            maxlen=redis_settings.REVOCATION_STREAM_MAXLEN,
         )
+        not_revoked_tokens.discard((payload["jti_access"], payload["jti_refresh"]))
 
 
 auth_utils = AuthUtils()
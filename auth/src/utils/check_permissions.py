@@ -6,6 +6,8 @@ from src.db.redis import get_redis
 
 
 def check_permissions(required_roles: list):
+    required_roles = frozenset(required_roles)
+
     def decorator(endpoint: Callable):
         @wraps(endpoint)
         async def wrapper(*args, **kwargs):
@@ -28,7 +30,7 @@ def check_permissions(required_roles: list):
             payload = await auth_utils.decode_token(token=token, cache=cache)
             user_roles = payload.get("roles")
 
-            if sum([role in user_roles for role in required_roles]) < 1:
+            if required_roles.isdisjoint(user_roles):
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail="Access forbidden: insufficient permissions",
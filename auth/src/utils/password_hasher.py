@@ -0,0 +1,97 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable
+
+import bcrypt
+from fastapi import HTTPException, status
+
+from src.core.settings import settings
+from src.utils.metrics import (
+    PASSWORD_HASH_PENDING,
+    PASSWORD_HASH_QUEUE_SECONDS,
+    PASSWORD_HASH_REJECTED,
+    PASSWORD_HASH_SECONDS,
+)
+
+hashing_settings = settings.hashing_settings
+
+
+def _hash_password(password: bytes) -> bytes:
+    return bcrypt.hashpw(password, bcrypt.gensalt())
+
+
+def _check_password(password: bytes, hashed_password: bytes) -> bool:
+    return bcrypt.checkpw(password, hashed_password)
+
+
+def _run_timed(func: Callable, submitted_at: float, *args):
+    started_at = time.monotonic()
+    result = func(*args)
+    return result, started_at - submitted_at, time.monotonic() - started_at
+
+
+class PasswordHasher:
+    """
+    Выполняет bcrypt в отдельном пуле, чтобы не блокировать event loop
+    """
+
+    def __init__(self, workers: int, queue_size: int, executor: str = "thread"):
+        self._workers = workers
+        self._capacity = workers + queue_size
+        self._executor_type = executor
+        self._executor: Executor | None = None
+        self._pending = 0
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            if self._executor_type == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self._workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._workers, thread_name_prefix="bcrypt"
+                )
+        return self._executor
+
+    async def _run(self, operation: str, func: Callable, *args):
+        if self._pending >= self._capacity:
+            PASSWORD_HASH_REJECTED.labels(operation).inc()
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Password hashing queue is full, try again later",
+                headers={"Retry-After": "1"},
+            )
+        self._pending += 1
+        PASSWORD_HASH_PENDING.inc()
+        try:
+            loop = asyncio.get_running_loop()
+            result, queue_wait, hash_time = await loop.run_in_executor(
+                self.executor, _run_timed, func, time.monotonic(), *args
+            )
+        finally:
+            self._pending -= 1
+            PASSWORD_HASH_PENDING.dec()
+        PASSWORD_HASH_QUEUE_SECONDS.labels(operation).observe(queue_wait)
+        PASSWORD_HASH_SECONDS.labels(operation).observe(hash_time)
+        return result
+
+    async def hash_password(self, password: str) -> bytes:
+        return await self._run("hash", _hash_password, password.encode("utf-8"))
+
+    async def check_password(self, password: str, hashed_password: bytes) -> bool:
+        return await self._run(
+            "check", _check_password, password.encode("utf-8"), hashed_password
+        )
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    workers=hashing_settings.PASSWORD_HASH_WORKERS,
+    queue_size=hashing_settings.PASSWORD_HASH_QUEUE_SIZE,
+    executor=hashing_settings.PASSWORD_HASH_EXECUTOR,
+)
@@ -0,0 +1,26 @@
+from typing import Sequence
+
+import orjson
+from fastapi import Response
+from sqlalchemy import Row
+
+
+def rows_response(
+    rows: Sequence[Row], fields: Sequence[str], headers: dict | None = None
+) -> Response:
+    """
+    Строки из запроса по колонкам сразу в JSON, без ORM-объектов и pydantic
+    """
+    return Response(
+        # default=str: asyncpg отдает UUID своим подклассом, orjson его не знает
+        content=orjson.dumps([dict(zip(fields, row)) for row in rows], default=str),
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+def total_headers(count: int, exact: bool) -> dict:
+    return {
+        "X-Total-Count": str(count),
+        "X-Total-Count-Exact": "true" if exact else "false",
+    }
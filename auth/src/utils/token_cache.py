@@ -0,0 +1,33 @@
+import time
+from collections import OrderedDict
+
+
+class NotRevokedCache:
+    """
+    Короткоживущий кеш пар jti, которые только что проверены по черному списку
+    """
+
+    def __init__(self, ttl_seconds: float, maxsize: int = 10000) -> None:
+        self._ttl = ttl_seconds
+        self._maxsize = maxsize
+        self._items: OrderedDict[tuple[str, str], float] = OrderedDict()
+
+    def contains(self, key: tuple[str, str]) -> bool:
+        expires_at = self._items.get(key)
+        if expires_at is None:
+            return False
+        if expires_at <= time.monotonic():
+            del self._items[key]
+            return False
+        return True
+
+    def add(self, key: tuple[str, str]) -> None:
+        if self._ttl <= 0:
+            return
+        self._items[key] = time.monotonic() + self._ttl
+        self._items.move_to_end(key)
+        while len(self._items) > self._maxsize:
+            self._items.popitem(last=False)
+
+    def discard(self, key: tuple[str, str]) -> None:
+        self._items.pop(key, None)
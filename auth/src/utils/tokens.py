@@ -0,0 +1,49 @@
+from pathlib import Path
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from jwt.algorithms import get_default_algorithms
+
+from src.utils.metrics import token_verify_timer
+
+
+class TokenSigner:
+    """
+    Подписывает токены ключом, загруженным один раз при старте
+    """
+
+    def __init__(self, private_key: Path, algorithm: str) -> None:
+        self.algorithm = algorithm
+        self._key = get_default_algorithms()[algorithm].prepare_key(
+            serialization.load_pem_private_key(private_key.read_bytes(), password=None)
+        )
+
+    def sign(self, payload: dict) -> str:
+        return jwt.encode(payload=payload, key=self._key, algorithm=self.algorithm)
+
+    def sign_many(self, payloads: list[dict]) -> list[str]:
+        return [self.sign(payload) for payload in payloads]
+
+
+class TokenVerifier:
+    """
+    Проверяет токены ключами, загруженными один раз при старте.
+    Ключ выбирается по alg из заголовка, каждый ключ принимает только свой alg
+    """
+
+    def __init__(self, public_keys: dict[str, Path]) -> None:
+        algorithms = get_default_algorithms()
+        self._keys = {
+            algorithm: algorithms[algorithm].prepare_key(
+                serialization.load_pem_public_key(path.read_bytes())
+            )
+            for algorithm, path in public_keys.items()
+        }
+
+    def verify(self, token: str | bytes) -> dict:
+        algorithm = jwt.get_unverified_header(token).get("alg")
+        key = self._keys.get(algorithm)
+        if key is None:
+            raise jwt.InvalidAlgorithmError("The specified alg value is not allowed")
+        with token_verify_timer():
+            return jwt.decode(jwt=token, key=key, algorithms=[algorithm])
@@ -0,0 +1,40 @@
+"""add active object_id index
+
+Revision ID: ea25e7db6efa
+Revises: 67f3421f7656
+Create Date: 2026-10-18 13:00:12.804417
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "ea25e7db6efa"
+down_revision: Union[str, None] = "67f3421f7656"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_comments_active_object_id_created_at_id",
+            "comments",
+            ["object_id", "created_at", "id"],
+            unique=False,
+            postgresql_where=sa.text("deleted_at IS NULL"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_comments_active_object_id_created_at_id",
+            table_name="comments",
+            postgresql_concurrently=True,
+        )
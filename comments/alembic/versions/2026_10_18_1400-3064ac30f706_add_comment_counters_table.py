@@ -0,0 +1,38 @@
+"""add comment counters table
+
+Revision ID: 3064ac30f706
+Revises: ea25e7db6efa
+Create Date: 2026-10-18 14:00:05.390214
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "3064ac30f706"
+down_revision: Union[str, None] = "ea25e7db6efa"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "comment_counters",
+        sa.Column("object_id", sa.UUID(), nullable=False),
+        sa.Column("count", sa.Integer(), server_default="0", nullable=False),
+        sa.PrimaryKeyConstraint("object_id"),
+    )
+    op.execute("""
+        INSERT INTO comment_counters (object_id, count)
+        SELECT object_id, count(*)
+        FROM comments
+        WHERE deleted_at IS NULL
+        GROUP BY object_id
+        """)
+
+
+def downgrade() -> None:
+    op.drop_table("comment_counters")
@@ -1,18 +1,63 @@
+import asyncio
 import logging
+from contextlib import asynccontextmanager, suppress
 
 import uvicorn
 from fastapi import FastAPI
+from redis.asyncio import Redis
+
+from src.db import redis
+from src.db.replicas import LsnMiddleware
+from src.db.session import db_session
 from src.utils.logger import LOGGING
+from src.utils.metrics import MetricsMiddleware
 from src.core.settings import settings
+from src.api import internal, metrics
 from src.api.v1 import comments
+from src.services.movies_client import movies_client
+from src.utils.auth_utils import revoked_tokens
+from src.utils.revocation import RevocationSubscriber
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    redis.redis = Redis(
+        host=settings.redis_settings.REDIS_HOST,
+        port=settings.redis_settings.REDIS_PORT,
+    )
+    subscriber = RevocationSubscriber(
+        revoked=revoked_tokens,
+        stream=settings.redis_settings.REVOCATION_STREAM,
+        replay_seconds=settings.redis_settings.REVOCATION_REPLAY_MINUTES * 60,
+    )
+    subscriber_task = asyncio.create_task(subscriber.run(redis.redis))
+    replicas_task = asyncio.create_task(db_session.monitor_replicas())
+    await movies_client.start()
+    try:
+        yield
+    finally:
+        for task in (subscriber_task, replicas_task):
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+        await movies_client.close()
+        await redis.redis.close()
+
 
 app = FastAPI(
     title=settings.PROJECT_TITLE,
     docs_url="/comments/api/openapi",
     openapi_url="/comments/api/openapi.json",
+    lifespan=lifespan,
+)
+app.add_middleware(
+    LsnMiddleware, sticky_seconds=settings.db_settings.COMMENTS_DB_STICKY_SECONDS
 )
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(comments.router, prefix="/comments/api", tags=["comments"])
+app.include_router(internal.router, prefix="/internal", tags=["internal"])
+app.include_router(metrics.router, tags=["internal"])
 
 if __name__ == "__main__":
     uvicorn.run(
@@ -0,0 +1,22 @@
+from fastapi import APIRouter
+
+from src.db.session import db_session
+
+router = APIRouter()
+
+
+@router.get("/db/pool")
+async def get_pool_stats() -> dict:
+    """
+    Состояние пула соединений с БД. Роутер подключен вне /<service>/api,
+    поэтому nginx его наружу не проксирует
+    """
+    return db_session.pool_stats()
+
+
+@router.get("/db/replicas")
+async def get_replicas_status() -> list[dict]:
+    """
+    Реплики для чтения: здоровье и отставание по последней проверке
+    """
+    return db_session.replicas_status()
@@ -1,5 +1,8 @@
+from typing import Literal
 from uuid import UUID
 
+import orjson
+
 from src.models import Comments
 from src.schemas.comments import (
     CreateCommentsSchema,
@@ -7,19 +10,36 @@ from src.schemas.comments import (
     UpdateCommentsSchema,
     PartialUpdateCommentsSchema,
     ShowCommentsSchema,
+    BulkUpdateCommentsSchema,
+    BatchCommentsSchema,
+    CommentsCountSchema,
 )
 from sqlalchemy.ext.asyncio import AsyncSession
-from fastapi import APIRouter, Depends, Response, status, Query, Request
+from fastapi import APIRouter, Body, Depends, Response, status, Query, Request
 
+from src.core.settings import settings
+from src.schemas.base import BulkResultSchema
 from src.schemas.users import UserSchema
 from src.services.crud.comments import crud_comments, user_comments
+from src.services.group_counter import comment_counters
 from src.db.session import db_session
 from src.utils.auth_utils import auth_utils
-from src.utils.check_permissions import check_permissions
+from src.utils.check_permissions import check_permissions, require_permissions
+from src.utils.pagination import next_cursor
+from src.utils.responses import (
+    batch_response,
+    item_response,
+    movie_expanded_response,
+    page_response,
+    rows_response,
+    total_headers,
+)
 
 
 router = APIRouter()
 
+SHOW_FIELDS = tuple(ShowCommentsSchema.model_fields)
+
 
 @router.post(
     "/",
@@ -55,13 +75,36 @@ async def get_comments(
         ge=1, le=100, description="Количество элементов на странице", default=1
     ),
     page_number: int = Query(ge=1, description="Номер страницы", default=1),
+    after: str | None = Query(
+        description="Курсор следующей страницы из заголовка X-Next-Cursor",
+        default=None,
+    ),
+    with_total: bool = Query(
+        description="Вернуть X-Total-Count: точный или оценку (X-Total-Count-Exact)",
+        default=False,
+    ),
+    expand: Literal["movie"] | None = Query(
+        description="movie: встроить в комментарии фильм по object_id",
+        default=None,
+    ),
     session: AsyncSession = Depends(db_session.get_session),
-) -> list[ShowCommentsSchema]:
-    return await crud_comments.get(
+) -> Response:
+    rows = await crud_comments.get_rows(
         session=session,
+        fields=SHOW_FIELDS,
         page_size=page_size,
         page_number=page_number,
+        after=after,
     )
+    cursor = next_cursor(rows, page_size)
+    headers = {"X-Next-Cursor": cursor} if cursor else {}
+    if with_total:
+        headers.update(total_headers(*await crud_comments.count(session)))
+    if expand == "movie":
+        return await movie_expanded_response(
+            [dict(zip(SHOW_FIELDS, row)) for row in rows], request, headers=headers
+        )
+    return rows_response(rows, SHOW_FIELDS, headers=headers)
 
 
 @router.get(
@@ -73,23 +116,193 @@ async def get_comments(
 @check_permissions(["user"])
 async def get_user_comments(
     request: Request,
+    response: Response,
     user_id: UUID,
     session: AsyncSession = Depends(db_session.get_session),
     page_size: int = Query(
         ge=1, le=100, description="Количество элементов на странице", default=1
     ),
     page_number: int = Query(ge=1, description="Номер страницы", default=1),
+    after: str | None = Query(
+        description="Курсор следующей страницы из заголовка X-Next-Cursor",
+        default=None,
+    ),
+    with_total: bool = Query(
+        description="Вернуть X-Total-Count: точный или оценку (X-Total-Count-Exact)",
+        default=False,
+    ),
+    expand: Literal["movie"] | None = Query(
+        description="movie: встроить в комментарии фильм по object_id",
+        default=None,
+    ),
 ) -> list[Comments]:
-    return await user_comments(
+    items = await user_comments(
         session=session,
         user_id=user_id,
         page_size=page_size,
         page_number=page_number,
+        after=after,
+    )
+    cursor = next_cursor(items, page_size)
+    headers = {"X-Next-Cursor": cursor} if cursor else {}
+    if with_total:
+        total = await crud_comments.count(
+            session, filters=[Comments.user_id == user_id]
+        )
+        headers.update(total_headers(*total))
+    if expand == "movie":
+        return await movie_expanded_response(
+            [{field: getattr(item, field) for field in SHOW_FIELDS} for item in items],
+            request,
+            headers=headers,
+        )
+    response.headers.update(headers)
+    return items
+
+
+@router.get(
+    "/object/{object_id}",
+    response_model=list[ShowCommentsSchema],
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(auth_utils.get_current_user)],
+)
+@check_permissions(["user"])
+async def get_object_comments(
+    request: Request,
+    object_id: UUID,
+    page_size: int = Query(
+        ge=1,
+        le=100,
+        description="Количество элементов на странице",
+        default=settings.OBJECT_PAGE_SIZE,
+    ),
+    after: str | None = Query(
+        description="Курсор следующей страницы из заголовка X-Next-Cursor",
+        default=None,
+    ),
+    with_total: bool = Query(
+        description="Вернуть X-Total-Count: точный или оценку (X-Total-Count-Exact)",
+        default=False,
+    ),
+    expand: Literal["movie"] | None = Query(
+        description="movie: встроить в комментарии фильм по object_id",
+        default=None,
+    ),
+    session: AsyncSession = Depends(db_session.get_session),
+) -> Response:
+    page = await crud_comments.object_page(
+        session=session,
+        object_id=object_id,
+        fields=SHOW_FIELDS,
+        page_size=page_size,
+        after=after,
+    )
+    headers = {}
+    if with_total:
+        total = await crud_comments.object_count(session, object_id=object_id)
+        headers.update(total_headers(*total))
+    if expand == "movie":
+        if page.cursor:
+            headers["X-Next-Cursor"] = page.cursor
+        return await movie_expanded_response(
+            orjson.loads(page.body), request, headers=headers
+        )
+    return page_response(page, headers=headers)
+
+
+@router.post(
+    "/batch",
+    response_model=BatchCommentsSchema,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(auth_utils.get_current_user)],
+)
+@check_permissions(["user"])
+async def get_comments_batch(
+    request: Request,
+    comment_ids: list[UUID] = Body(min_length=1, max_length=settings.BATCH_MAX_ITEMS),
+    session: AsyncSession = Depends(db_session.get_read_session),
+) -> Response:
+    rows, missing = await crud_comments.get_many(
+        session=session, ids=comment_ids, fields=SHOW_FIELDS
+    )
+    return batch_response(rows, SHOW_FIELDS, missing)
+
+
+@router.post(
+    "/bulk",
+    response_model=list[BulkResultSchema],
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(require_permissions("comments.bulk"))],
+)
+async def bulk_create_comments(
+    comments_schema: list[CreateCommentsSchema] = Body(
+        min_length=1, max_length=settings.BULK_MAX_ITEMS
+    ),
+    user: UserSchema = Depends(auth_utils.get_current_user),
+    session: AsyncSession = Depends(db_session.get_session),
+) -> list[BulkResultSchema]:
+    return await crud_comments.bulk_create(
+        session=session,
+        objs_schema=[
+            CreateCommentsWithUserIDSchema(
+                **comment_schema.model_dump(), user_id=user.user_id
+            )
+            for comment_schema in comments_schema
+        ],
+    )
+
+
+@router.patch(
+    "/bulk",
+    response_model=list[BulkResultSchema],
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(require_permissions("comments.bulk"))],
+)
+async def bulk_update_comments(
+    comments_schema: list[BulkUpdateCommentsSchema] = Body(
+        min_length=1, max_length=settings.BULK_MAX_ITEMS
+    ),
+    session: AsyncSession = Depends(db_session.get_session),
+) -> list[BulkResultSchema]:
+    return await crud_comments.bulk_update(session=session, objs_schema=comments_schema)
+
+
+@router.delete(
+    "/bulk",
+    response_model=list[BulkResultSchema],
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(require_permissions("comments.bulk"))],
+)
+async def bulk_delete_comments(
+    comment_ids: list[UUID] = Body(min_length=1, max_length=settings.BULK_MAX_ITEMS),
+    session: AsyncSession = Depends(db_session.get_session),
+) -> list[BulkResultSchema]:
+    return await crud_comments.bulk_delete(session=session, ids=comment_ids)
+
+
+@router.post(
+    "/counts",
+    response_model=list[CommentsCountSchema],
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(auth_utils.get_current_user)],
+)
+@check_permissions(["user"])
+async def get_comments_counts(
+    request: Request,
+    object_ids: list[UUID] = Body(min_length=1, max_length=settings.COUNTS_MAX_ITEMS),
+    session: AsyncSession = Depends(db_session.get_read_session),
+) -> list[CommentsCountSchema]:
+    counts = await comment_counters.get_many(
+        session=session, groups=list(dict.fromkeys(object_ids))
     )
+    return [
+        CommentsCountSchema(object_id=object_id, count=counts[object_id])
+        for object_id in object_ids
+    ]
 
 
 @router.get(
-    "/{movie_id}",
+    "/{comment_id}",
     response_model=ShowCommentsSchema,
     status_code=status.HTTP_200_OK,
     dependencies=[Depends(auth_utils.get_current_user)],
@@ -99,12 +312,15 @@ async def get_comment(
     request: Request,
     comment_id: UUID,
     session: AsyncSession = Depends(db_session.get_session),
-) -> ShowCommentsSchema:
-    return await crud_comments.get_by_id(session=session, id_=comment_id)
+) -> Response:
+    item = await crud_comments.get_by_id_cached(
+        session=session, id_=comment_id, fields=SHOW_FIELDS
+    )
+    return item_response(item, request)
 
 
 @router.put(
-    "/{movie_id}",
+    "/{comment_id}",
     response_model=ShowCommentsSchema,
     status_code=status.HTTP_200_OK,
     dependencies=[Depends(auth_utils.get_current_user)],
@@ -112,19 +328,21 @@ async def get_comment(
 @check_permissions(["user"])
 async def update_comments(
     request: Request,
-    movie_id: UUID,
+    comment_id: UUID,
     comments_schema: UpdateCommentsSchema,
+    user: UserSchema = Depends(auth_utils.get_current_user),
     session: AsyncSession = Depends(db_session.get_session),
 ) -> ShowCommentsSchema:
     return await crud_comments.update(
         session=session,
         obj_schema=comments_schema,
-        id_=movie_id,
+        id_=comment_id,
+        owner_id=user.user_id,
     )
 
 
 @router.patch(
-    "/{movie_id}",
+    "/{comment_id}",
     response_model=ShowCommentsSchema,
     status_code=status.HTTP_200_OK,
     dependencies=[Depends(auth_utils.get_current_user)],
@@ -132,28 +350,31 @@ async def update_comments(
 @check_permissions(["user"])
 async def particular_update_comments(
     request: Request,
-    movie_id: UUID,
+    comment_id: UUID,
     comments_schema: PartialUpdateCommentsSchema,
+    user: UserSchema = Depends(auth_utils.get_current_user),
     session: AsyncSession = Depends(db_session.get_session),
 ) -> ShowCommentsSchema:
     return await crud_comments.update(
         session=session,
         obj_schema=comments_schema,
-        id_=movie_id,
+        id_=comment_id,
         particular=True,
+        owner_id=user.user_id,
     )
 
 
 @router.delete(
-    "/{movie_id}",
+    "/{comment_id}",
     status_code=status.HTTP_204_NO_CONTENT,
     dependencies=[Depends(auth_utils.get_current_user)],
 )
 @check_permissions(["user"])
 async def delete_comments(
     request: Request,
-    comments_id: UUID,
+    comment_id: UUID,
+    user: UserSchema = Depends(auth_utils.get_current_user),
     session: AsyncSession = Depends(db_session.get_session),
 ) -> Response:
-    await crud_comments.delete(session=session, id_=comments_id)
+    await crud_comments.delete(session=session, id_=comment_id, owner_id=user.user_id)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
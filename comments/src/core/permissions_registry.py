@@ -0,0 +1,23 @@
+from typing import Iterable
+
+# Порядок задает номер бита в claim "perms": новые права добавляются в конец,
+# при удалении или перестановке элементов нужно увеличить версию реестра
+PERMISSIONS_REGISTRY_VERSION = 1
+PERMISSIONS_REGISTRY: tuple[str, ...] = (
+    "movies.create",
+    "movies.update",
+    "movies.delete",
+    "movies.bulk",
+    "comments.create",
+    "comments.update",
+    "comments.delete",
+    "comments.bulk",
+)
+PERMISSION_BITS = {name: 1 << bit for bit, name in enumerate(PERMISSIONS_REGISTRY)}
+
+
+def compile_permissions(names: Iterable[str]) -> int:
+    mask = 0
+    for name in names:
+        mask |= PERMISSION_BITS.get(name, 0)
+    return mask
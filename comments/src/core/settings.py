@@ -1,4 +1,6 @@
 from pathlib import Path
+from typing import Literal
+from uuid import uuid4
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 
@@ -6,6 +8,8 @@ load_dotenv()
 
 COMMENTS_BASE_DIR = Path(__file__).parent.parent.parent
 
+JWTAlgorithm = Literal["RS256", "ES256", "EdDSA"]
+
 
 class DBSettings(BaseSettings):
     COMMENTS_DB_HOST: str = "localhost"
@@ -13,25 +17,110 @@ class DBSettings(BaseSettings):
     COMMENTS_DB_USER: str = "postgres"
     COMMENTS_DB_PASS: str = "postgres"
     COMMENTS_DB_NAME: str = "postgres"
+    COMMENTS_DB_POOL_SIZE: int = 5
+    COMMENTS_DB_MAX_OVERFLOW: int = 10
+    COMMENTS_DB_POOL_TIMEOUT: float = 30
+    COMMENTS_DB_POOL_RECYCLE: int = 1800
+    COMMENTS_DB_POOL_PRE_PING: bool = False
+    COMMENTS_DB_STATEMENT_CACHE_SIZE: int = 100
+    # PgBouncer в режиме transaction не сохраняет prepared statements между
+    # транзакциями, поэтому кеши выражений отключаются
+    COMMENTS_DB_PGBOUNCER: bool = False
+    # Реплики для чтения: "host:port,host:port", учетные данные как у primary
+    COMMENTS_DB_REPLICA_HOSTS: str = ""
+    COMMENTS_DB_REPLICA_MAX_LAG_SECONDS: float = 2
+    COMMENTS_DB_REPLICA_CHECK_INTERVAL_SECONDS: float = 0.5
+    # Сколько живет cookie с LSN последней записи клиента
+    COMMENTS_DB_STICKY_SECONDS: int = 5
 
     @property
     def auth_async_database_url(self):
         return f"postgresql+asyncpg://{self.COMMENTS_DB_USER}:{self.COMMENTS_DB_PASS}@{self.COMMENTS_DB_HOST}:{self.COMMENTS_DB_PORT}/{self.COMMENTS_DB_NAME}"
 
+    @property
+    def replica_database_urls(self) -> list[str]:
+        return [
+            f"postgresql+asyncpg://{self.COMMENTS_DB_USER}:{self.COMMENTS_DB_PASS}@{host.strip()}/{self.COMMENTS_DB_NAME}"
+            for host in self.COMMENTS_DB_REPLICA_HOSTS.split(",")
+            if host.strip()
+        ]
+
+    @property
+    def engine_options(self) -> dict:
+        if self.COMMENTS_DB_PGBOUNCER:
+            connect_args = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+            }
+        else:
+            connect_args = {
+                "prepared_statement_cache_size": self.COMMENTS_DB_STATEMENT_CACHE_SIZE
+            }
+        return {
+            "pool_size": self.COMMENTS_DB_POOL_SIZE,
+            "max_overflow": self.COMMENTS_DB_MAX_OVERFLOW,
+            "pool_timeout": self.COMMENTS_DB_POOL_TIMEOUT,
+            "pool_recycle": self.COMMENTS_DB_POOL_RECYCLE,
+            "pool_pre_ping": self.COMMENTS_DB_POOL_PRE_PING,
+            "connect_args": connect_args,
+        }
+
 
 class JWTSettings(BaseSettings):
     COMMENTS_PUBLIC_KEY_FILE: str
-    ALGORITHM: str
+    ALGORITHM: JWTAlgorithm
+    # на время перехода на новый алгоритм продолжаем принимать токены старого
+    COMMENTS_PREVIOUS_PUBLIC_KEY_FILE: str | None = None
+    PREVIOUS_ALGORITHM: JWTAlgorithm | None = None
+    VERIFIED_TOKEN_CACHE_SIZE: int = 10000
 
     @property
     def jwt_public_key(self) -> Path:
         return COMMENTS_BASE_DIR / "src/core/certs" / self.COMMENTS_PUBLIC_KEY_FILE
 
+    @property
+    def jwt_public_keys(self) -> dict[str, Path]:
+        keys = {}
+        if self.COMMENTS_PREVIOUS_PUBLIC_KEY_FILE and self.PREVIOUS_ALGORITHM:
+            keys[self.PREVIOUS_ALGORITHM] = (
+                COMMENTS_BASE_DIR / "src/core/certs" / self.COMMENTS_PREVIOUS_PUBLIC_KEY_FILE
+            )
+        keys[self.ALGORITHM] = self.jwt_public_key
+        return keys
+
+
+class RedisSettings(BaseSettings):
+    REDIS_HOST: str = "localhost"
+    REDIS_PORT: int = 6379
+    REVOCATION_STREAM: str = "auth:revoked"
+    REVOCATION_REPLAY_MINUTES: int = 60
+    ITEM_CACHE_TTL_SECONDS: int = 300
+    ITEM_LOCAL_CACHE_TTL_SECONDS: float = 5
+    ITEM_LOCAL_CACHE_SIZE: int = 10000
+    COMMENT_COUNT_CACHE_TTL_SECONDS: int = 60
+    OBJECT_FIRST_PAGE_CACHE_TTL_SECONDS: int = 30
+
+
+class MoviesServiceSettings(BaseSettings):
+    MOVIES_SERVICE_URL: str = "http://localhost:8002"
+    MOVIES_EXPAND_DEADLINE_SECONDS: float = 0.3
+    MOVIES_EXPAND_CACHE_TTL_SECONDS: float = 30
+    MOVIES_EXPAND_CACHE_SIZE: int = 10000
+    MOVIES_CLIENT_MAX_CONNECTIONS: int = 50
+
 
 class Settings(BaseSettings):
     PROJECT_TITLE: str = "auth"
     db_settings: DBSettings = DBSettings()
     jwt_settings: JWTSettings = JWTSettings()
+    redis_settings: RedisSettings = RedisSettings()
+    movies_settings: MoviesServiceSettings = MoviesServiceSettings()
+    BULK_MAX_ITEMS: int = 1000
+    BATCH_MAX_ITEMS: int = 500
+    TOTAL_COUNT_CAP: int = 1000
+    COUNTS_MAX_ITEMS: int = 500
+    OBJECT_PAGE_SIZE: int = 20
 
 
 settings = Settings()
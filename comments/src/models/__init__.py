@@ -1,3 +1,7 @@
-__all__ = ("Comments",)
+__all__ = (
+    "Comments",
+    "CommentCounter",
+)
 
 from src.models.movies import Comments
+from src.models.comment_counters import CommentCounter
@@ -0,0 +1,15 @@
+from uuid import UUID
+
+from sqlalchemy import Integer
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from src.models.base import Base
+
+
+class CommentCounter(Base):
+    __tablename__ = "comment_counters"
+
+    repr_columns = ["object_id", "count"]
+
+    object_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, server_default="0")
@@ -1,13 +1,35 @@
 from uuid import UUID
 
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import Text
+from sqlalchemy import Text, Index, text as sql_text
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from src.models.base import IdCUDMixin
 
 
 class Comments(IdCUDMixin):
     __tablename__ = "comments"
+    __table_args__ = (
+        Index(
+            "ix_comments_active_created_at_id",
+            "created_at",
+            "id",
+            postgresql_where=sql_text("deleted_at IS NULL"),
+        ),
+        Index(
+            "ix_comments_active_user_id_created_at_id",
+            "user_id",
+            "created_at",
+            "id",
+            postgresql_where=sql_text("deleted_at IS NULL"),
+        ),
+        Index(
+            "ix_comments_active_object_id_created_at_id",
+            "object_id",
+            "created_at",
+            "id",
+            postgresql_where=sql_text("deleted_at IS NULL"),
+        ),
+    )
 
     text: Mapped[UUID] = mapped_column(Text)
     object_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True))
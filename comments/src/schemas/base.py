@@ -1,6 +1,13 @@
+from uuid import UUID
+
 from pydantic import BaseModel
 
 
 class BaseSchema(BaseModel):
     class Config:
         from_attributes = True
+
+
+class BulkResultSchema(BaseSchema):
+    id: UUID
+    status: int
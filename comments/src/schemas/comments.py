@@ -1,5 +1,7 @@
 from uuid import UUID
 
+from pydantic import field_validator
+
 from src.schemas.base import BaseSchema
 
 
@@ -27,4 +29,29 @@ class UpdateCommentsSchema(CommentsSchema):
 
 class PartialUpdateCommentsSchema(CommentsSchema):
     text: str | None = None
-    object_id: str | None = None
+    object_id: UUID | None = None
+
+
+class BulkUpdateCommentsSchema(PartialUpdateCommentsSchema):
+    id: UUID
+
+    @field_validator("text", "object_id")
+    @classmethod
+    def not_null(cls, value):
+        """
+        null не отличить от пропуска в UPDATE ... FROM (VALUES ...): чтобы
+        оставить поле как есть, его нужно не передавать
+        """
+        if value is None:
+            raise ValueError("null is not allowed, omit the field instead")
+        return value
+
+
+class CommentsCountSchema(BaseSchema):
+    object_id: UUID
+    count: int
+
+
+class BatchCommentsSchema(BaseSchema):
+    items: list[ShowCommentsSchema]
+    missing: list[UUID]
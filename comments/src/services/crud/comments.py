@@ -1,3 +1,4 @@
+from typing import Iterable, Sequence
 from uuid import UUID
 
 from sqlalchemy import select
@@ -10,7 +11,13 @@ from src.schemas.comments import (
     PartialUpdateCommentsSchema,
 )
 from src.services.crud.base import ModelManager
+from src.services.group_counter import comment_counters
+from src.services.item_cache import item_cache
 from src.models.movies import Comments
+from src.core.settings import settings
+from src.services.page_cache import CachedPage, object_first_pages
+from src.utils.pagination import Total, next_cursor, paginate
+from src.utils.responses import encode_rows
 
 
 class CommentsManager(
@@ -22,23 +29,75 @@ class CommentsManager(
         PartialUpdateCommentsSchema,
     ]
 ):
-    pass
+    async def object_page(
+        self,
+        session: AsyncSession,
+        object_id: UUID,
+        fields: Sequence[str],
+        page_size: int,
+        after: str | None = None,
+    ) -> CachedPage:
+        """
+        Комментарии объекта от новых к старым; первая страница стандартного
+        размера берется из кеша
+        """
+        cacheable = (
+            object_first_pages.enabled
+            and after is None
+            and page_size == settings.OBJECT_PAGE_SIZE
+        )
+        if cacheable:
+            page = await object_first_pages.get(object_id)
+            if page is not None:
+                return page
+        rows = await self.get_rows(
+            session,
+            fields=fields,
+            page_size=page_size,
+            after=after,
+            filters=[Comments.object_id == object_id],
+            descending=True,
+        )
+        page = CachedPage(
+            body=encode_rows(rows, fields), cursor=next_cursor(rows, page_size)
+        )
+        if cacheable:
+            await object_first_pages.put(object_id, page)
+        return page
 
+    async def object_count(self, session: AsyncSession, object_id: UUID) -> Total:
+        """
+        Число комментариев объекта из счетчика comment_counters, всегда точное
+        """
+        counts = await self._counter.get_many(session, groups=[object_id])
+        return Total(count=counts[object_id], exact=True)
 
-crud_comments = CommentsManager(Comments)
+    async def _drop_cached(self, *ids: UUID, groups: Iterable = ()) -> None:
+        await super()._drop_cached(*ids, groups=groups)
+        await object_first_pages.invalidate(*groups)
+
+
+crud_comments = CommentsManager(
+    Comments, cache=item_cache, counter=comment_counters
+)
 
 
 async def user_comments(
     user_id: UUID,
     session: AsyncSession,
     page_size: int,
-    page_number: int,
+    page_number: int = 1,
+    after: str | None = None,
 ) -> list[Comments]:
-    page_from = page_size * (page_number - 1)
     comments = await session.scalars(
-        select(Comments)
-        .where(Comments.user_id == user_id)
-        .offset(page_from)
-        .limit(page_size)
+        paginate(
+            select(Comments).where(
+                Comments.user_id == user_id, Comments.deleted_at.is_(None)
+            ),
+            model=Comments,
+            page_size=page_size,
+            page_number=page_number,
+            after=after,
+        )
     )
     return list(comments)
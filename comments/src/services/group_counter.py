@@ -0,0 +1,99 @@
+import logging
+from uuid import UUID
+
+from redis.exceptions import RedisError
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.settings import settings
+from src.db.redis import get_redis
+from src.models.base import Base
+from src.models.comment_counters import CommentCounter
+
+logger = logging.getLogger(__name__)
+
+redis_settings = settings.redis_settings
+
+
+class GroupCounter:
+    """
+    Количество живых записей по значению поля (например, комментариев по object_id).
+    Меняется в той же транзакции, что и сами записи; прочитанные значения
+    кешируются в Redis и сбрасываются после коммита изменений
+    """
+
+    def __init__(self, model: type[Base], field: str, redis_ttl: int):
+        self.field = field
+        self._model = model
+        self._redis_ttl = redis_ttl
+
+    def _key(self, group: UUID) -> str:
+        return f"count:{self._model.__tablename__}:{group}"
+
+    async def add(self, session: AsyncSession, deltas: dict[UUID, int]) -> None:
+        if not deltas:
+            return
+        # одинаковый порядок строк, чтобы параллельные пачки не ловили deadlock
+        stmt = insert(self._model).values(
+            [
+                {self.field: group, "count": delta}
+                for group, delta in sorted(deltas.items())
+            ]
+        )
+        await session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[self.field],
+                set_={"count": self._model.count + stmt.excluded.count},
+            )
+        )
+
+    async def get_many(
+        self, session: AsyncSession, groups: list[UUID]
+    ) -> dict[UUID, int]:
+        cache = await get_redis()
+        try:
+            cached = await cache.mget([self._key(group) for group in groups])
+        except RedisError as e:
+            logger.warning("Counter cache is unavailable: %s", e)
+            cache, cached = None, [None] * len(groups)
+        counts = {
+            group: int(value)
+            for group, value in zip(groups, cached)
+            if value is not None
+        }
+        missing = [group for group in groups if group not in counts]
+        if not missing:
+            return counts
+        column = getattr(self._model, self.field)
+        result = await session.execute(
+            select(column, self._model.count).where(column.in_(missing))
+        )
+        loaded = dict.fromkeys(missing, 0)
+        loaded.update(result.all())
+        counts.update(loaded)
+        if cache is not None:
+            try:
+                await cache.put_many(
+                    {self._key(group): count for group, count in loaded.items()},
+                    cache_time=self._redis_ttl,
+                )
+            except RedisError as e:
+                logger.warning("Counter cache is unavailable: %s", e)
+        return counts
+
+    async def invalidate(self, *groups: UUID) -> None:
+        if not groups:
+            return
+        try:
+            cache = await get_redis()
+            await cache.delete(*[self._key(group) for group in groups])
+        except RedisError as e:
+            logger.warning("Failed to invalidate counters %s: %s", groups, e)
+
+
+comment_counters = GroupCounter(
+    model=CommentCounter,
+    field="object_id",
+    redis_ttl=redis_settings.COMMENT_COUNT_CACHE_TTL_SECONDS,
+)
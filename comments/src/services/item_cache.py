@@ -0,0 +1,104 @@
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from uuid import UUID
+
+from redis.exceptions import RedisError
+
+from src.core.settings import settings
+from src.db.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+redis_settings = settings.redis_settings
+
+
+@dataclass(frozen=True, slots=True)
+class CachedItem:
+    body: bytes
+    etag: str
+
+    @classmethod
+    def build(cls, body: bytes, updated_at: datetime) -> "CachedItem":
+        return cls(body=body, etag=f'"{int(updated_at.timestamp() * 1_000_000):x}"')
+
+
+class ItemCache:
+    """
+    Кеш отдельных записей для get_by_id: L1 в памяти процесса, L2 в Redis.
+    В Redis лежит "<etag> <json>". L1 живет несколько секунд, так как его нельзя
+    сбросить в соседних процессах
+    """
+
+    def __init__(self, local_ttl: float, redis_ttl: int, maxsize: int = 10000):
+        self._local_ttl = local_ttl
+        self._redis_ttl = redis_ttl
+        self._maxsize = maxsize
+        self._local: OrderedDict[str, tuple[float, CachedItem]] = OrderedDict()
+
+    @staticmethod
+    def _key(table: str, id_: int | UUID) -> str:
+        return f"item:{table}:{id_}"
+
+    def _put_local(self, key: str, item: CachedItem) -> None:
+        if self._local_ttl <= 0:
+            return
+        self._local[key] = (time.monotonic() + self._local_ttl, item)
+        self._local.move_to_end(key)
+        while len(self._local) > self._maxsize:
+            self._local.popitem(last=False)
+
+    async def get(self, table: str, id_: int | UUID) -> CachedItem | None:
+        key = self._key(table, id_)
+        local = self._local.get(key)
+        if local is not None:
+            expires_at, item = local
+            if expires_at > time.monotonic():
+                return item
+            del self._local[key]
+        try:
+            cache = await get_redis()
+            raw = await cache.get(key)
+        except RedisError as e:
+            logger.warning("Item cache is unavailable: %s", e)
+            return None
+        if raw is None:
+            return None
+        etag, body = raw.split(b" ", 1)
+        item = CachedItem(body=body, etag=etag.decode())
+        self._put_local(key, item)
+        return item
+
+    async def put(self, table: str, id_: int | UUID, item: CachedItem) -> None:
+        key = self._key(table, id_)
+        try:
+            cache = await get_redis()
+            await cache.put(
+                key=key,
+                value=item.etag.encode() + b" " + item.body,
+                cache_time=self._redis_ttl,
+            )
+        except RedisError as e:
+            logger.warning("Item cache is unavailable: %s", e)
+        self._put_local(key, item)
+
+    async def invalidate(self, table: str, *ids: int | UUID) -> None:
+        if not ids:
+            return
+        keys = [self._key(table, id_) for id_ in ids]
+        for key in keys:
+            self._local.pop(key, None)
+        try:
+            cache = await get_redis()
+            await cache.delete(*keys)
+        except RedisError as e:
+            logger.warning("Failed to invalidate cached items %s: %s", keys, e)
+
+
+item_cache = ItemCache(
+    local_ttl=redis_settings.ITEM_LOCAL_CACHE_TTL_SECONDS,
+    redis_ttl=redis_settings.ITEM_CACHE_TTL_SECONDS,
+    maxsize=redis_settings.ITEM_LOCAL_CACHE_SIZE,
+)
@@ -0,0 +1,123 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Iterable
+from uuid import UUID
+
+import httpx
+
+from src.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+movies_settings = settings.movies_settings
+
+
+class MoviesClient:
+    """
+    Клиент сервиса movies для expand=movie: общий пул соединений на процесс,
+    один POST /movies/api/batch на страницу и короткий кеш в памяти процесса.
+    Отсутствующие в movies id тоже кешируются (как None)
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        deadline: float,
+        cache_ttl: float,
+        cache_size: int = 10000,
+        max_connections: int = 50,
+    ):
+        self._base_url = base_url
+        self._deadline = deadline
+        self._cache_ttl = cache_ttl
+        self._cache_size = cache_size
+        self._max_connections = max_connections
+        self._client: httpx.AsyncClient | None = None
+        self._cache: OrderedDict[UUID, tuple[float, dict | None]] = OrderedDict()
+
+    async def start(self) -> None:
+        self._client = httpx.AsyncClient(
+            base_url=self._base_url,
+            timeout=self._deadline,
+            limits=httpx.Limits(
+                max_connections=self._max_connections,
+                max_keepalive_connections=self._max_connections,
+            ),
+        )
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _put_local(self, id_: UUID, movie: dict | None, expires_at: float) -> None:
+        self._cache[id_] = (expires_at, movie)
+        self._cache.move_to_end(id_)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    async def get_many(
+        self, ids: Iterable[UUID], authorization: str | None
+    ) -> tuple[dict[UUID, dict | None], bool]:
+        """
+        Фильмы по id. Второе значение False, если movies не ответил за deadline
+        или с ошибкой: тогда в словаре только то, что было в кеше
+        """
+        now = time.monotonic()
+        movies, missing = {}, []
+        for id_ in dict.fromkeys(ids):
+            cached = self._cache.get(id_)
+            if cached is not None and cached[0] > now:
+                movies[id_] = cached[1]
+            else:
+                missing.append(id_)
+        if not missing:
+            return movies, True
+        if self._client is None:
+            return movies, False
+        try:
+            async with asyncio.timeout(self._deadline):
+                response = await self._client.post(
+                    "/movies/api/batch",
+                    json=[str(id_) for id_ in missing],
+                    headers={"Authorization": authorization} if authorization else None,
+                )
+                response.raise_for_status()
+        except (TimeoutError, httpx.HTTPError) as e:
+            logger.warning("Movies service is unavailable: %r", e)
+            return movies, False
+        fetched = dict.fromkeys(missing)
+        try:
+            for movie in response.json()["items"]:
+                fetched[UUID(movie["id"])] = movie
+        except (ValueError, KeyError, TypeError) as e:
+            # не JSON или чужая схема, например страница ошибки прокси
+            logger.warning("Unexpected movies service response: %r", e)
+            return movies, False
+        expires_at = time.monotonic() + self._cache_ttl
+        for id_, movie in fetched.items():
+            self._put_local(id_, movie, expires_at)
+        movies.update(fetched)
+        return movies, True
+
+
+async def expand_movies(items: list[dict], authorization: str | None) -> bool:
+    """
+    Встраивает в каждый комментарий поле movie по object_id
+    """
+    object_ids = [UUID(str(item["object_id"])) for item in items]
+    movies, complete = await movies_client.get_many(object_ids, authorization)
+    for item, object_id in zip(items, object_ids):
+        item["movie"] = movies.get(object_id)
+    return complete
+
+
+movies_client = MoviesClient(
+    base_url=movies_settings.MOVIES_SERVICE_URL,
+    deadline=movies_settings.MOVIES_EXPAND_DEADLINE_SECONDS,
+    cache_ttl=movies_settings.MOVIES_EXPAND_CACHE_TTL_SECONDS,
+    cache_size=movies_settings.MOVIES_EXPAND_CACHE_SIZE,
+    max_connections=movies_settings.MOVIES_CLIENT_MAX_CONNECTIONS,
+)
@@ -0,0 +1,105 @@
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from uuid import UUID
+
+from redis.exceptions import RedisError
+
+from src.core.settings import settings
+from src.db.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+redis_settings = settings.redis_settings
+
+
+@dataclass(frozen=True, slots=True)
+class CachedPage:
+    body: bytes
+    cursor: str | None
+
+
+class PageCache:
+    """
+    Кеш первой страницы списка по группе (комментарии одного фильма):
+    L1 в памяти процесса и Redis. В Redis лежит "<курсор> <json>",
+    пустой курсор - страница последняя
+    """
+
+    def __init__(
+        self, name: str, local_ttl: float, redis_ttl: int, maxsize: int = 10000
+    ):
+        self._name = name
+        self._local_ttl = local_ttl
+        self._redis_ttl = redis_ttl
+        self._maxsize = maxsize
+        self._local: OrderedDict[str, tuple[float, CachedPage]] = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self._redis_ttl > 0
+
+    def _key(self, group: UUID) -> str:
+        return f"page:{self._name}:{group}"
+
+    def _put_local(self, key: str, page: CachedPage) -> None:
+        if self._local_ttl <= 0:
+            return
+        self._local[key] = (time.monotonic() + self._local_ttl, page)
+        self._local.move_to_end(key)
+        while len(self._local) > self._maxsize:
+            self._local.popitem(last=False)
+
+    async def get(self, group: UUID) -> CachedPage | None:
+        key = self._key(group)
+        local = self._local.get(key)
+        if local is not None:
+            expires_at, page = local
+            if expires_at > time.monotonic():
+                return page
+            del self._local[key]
+        try:
+            cache = await get_redis()
+            raw = await cache.get(key)
+        except RedisError as e:
+            logger.warning("Page cache is unavailable: %s", e)
+            return None
+        if raw is None:
+            return None
+        cursor, body = raw.split(b" ", 1)
+        page = CachedPage(body=body, cursor=cursor.decode() or None)
+        self._put_local(key, page)
+        return page
+
+    async def put(self, group: UUID, page: CachedPage) -> None:
+        key = self._key(group)
+        try:
+            cache = await get_redis()
+            await cache.put(
+                key=key,
+                value=(page.cursor or "").encode() + b" " + page.body,
+                cache_time=self._redis_ttl,
+            )
+        except RedisError as e:
+            logger.warning("Page cache is unavailable: %s", e)
+        self._put_local(key, page)
+
+    async def invalidate(self, *groups: UUID) -> None:
+        if not groups or not self.enabled:
+            return
+        keys = [self._key(group) for group in groups]
+        for key in keys:
+            self._local.pop(key, None)
+        try:
+            cache = await get_redis()
+            await cache.delete(*keys)
+        except RedisError as e:
+            logger.warning("Failed to invalidate cached pages %s: %s", keys, e)
+
+
+object_first_pages = PageCache(
+    name="comments:object",
+    local_ttl=redis_settings.ITEM_LOCAL_CACHE_TTL_SECONDS,
+    redis_ttl=redis_settings.OBJECT_FIRST_PAGE_CACHE_TTL_SECONDS,
+)
@@ -3,9 +3,15 @@ from src.core.settings import settings
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from src.schemas.users import UserSchema
+from src.utils.revocation import RevokedTokens
+from src.utils.token_cache import VerifiedTokenCache
+from src.utils.tokens import TokenVerifier
 
 jwt_settings = settings.jwt_settings
 http_bearer = HTTPBearer(auto_error=True)
+verified_tokens = VerifiedTokenCache(maxsize=jwt_settings.VERIFIED_TOKEN_CACHE_SIZE)
+revoked_tokens = RevokedTokens()
+token_verifier = TokenVerifier(public_keys=jwt_settings.jwt_public_keys)
 
 
 class JWTUtils:
@@ -13,18 +19,22 @@ class JWTUtils:
     @staticmethod
     def decode_token(
         token: str | bytes,
-        key: str = jwt_settings.jwt_public_key.read_text(),
-        algorithm: str = jwt_settings.ALGORITHM,
+        verifier: TokenVerifier = token_verifier,
     ):
-        try:
-            encode = jwt.decode(
-                jwt=token,
-                key=key,
-                algorithms=[algorithm],
-            )
-        except jwt.InvalidTokenError:
+        cache_key = verified_tokens.digest(token)
+        encode = verified_tokens.get(cache_key)
+        if encode is None:
+            try:
+                encode = verifier.verify(token)
+            except jwt.InvalidTokenError:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
+                )
+            verified_tokens.put(cache_key, encode)
+        if revoked_tokens.is_revoked(encode):
             raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Token is in black list",
             )
         return encode
 
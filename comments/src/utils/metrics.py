@@ -0,0 +1,137 @@
+import time
+from contextlib import contextmanager
+
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# границы в секундах: запросы к БД и Redis обычно укладываются в миллисекунды
+FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1)
+TOKEN_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "Время обработки HTTP-запроса",
+    ["method", "route", "status"],
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP-запросы в обработке",
+    ["method"],
+)
+SQL_QUERY_SECONDS = Histogram(
+    "db_query_duration_seconds",
+    "Время выполнения SQL-запроса",
+    ["engine", "operation"],
+    buckets=FAST_BUCKETS,
+)
+SQL_QUERY_ERRORS = Counter(
+    "db_query_errors",
+    "SQL-запросы, завершившиеся ошибкой",
+    ["engine", "operation"],
+)
+REDIS_COMMAND_SECONDS = Histogram(
+    "redis_command_duration_seconds",
+    "Время выполнения команды RedisCache",
+    ["command"],
+    buckets=FAST_BUCKETS,
+)
+REDIS_COMMAND_ERRORS = Counter(
+    "redis_command_errors",
+    "Команды RedisCache, завершившиеся ошибкой",
+    ["command"],
+)
+TOKEN_VERIFY_SECONDS = Histogram(
+    "token_verify_duration_seconds",
+    "Время проверки подписи JWT",
+    ["result"],
+    buckets=TOKEN_BUCKETS,
+)
+
+
+class MetricsMiddleware:
+    """
+    Время и число одновременных HTTP-запросов. Маршрут берется шаблоном пути
+    (/movies/api/{movie_id}), чтобы не плодить метки на каждый id
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        method = scope["method"]
+        status_code = 500
+
+        async def send_with_status(message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_flight = HTTP_REQUESTS_IN_FLIGHT.labels(method)
+        in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_flight.dec()
+            route = scope.get("route")
+            HTTP_REQUEST_SECONDS.labels(
+                method, route.path if route else "unmatched", status_code
+            ).observe(time.perf_counter() - start)
+
+
+def sql_operation(statement: str | None) -> str:
+    words = (statement or "").split(None, 1)
+    return words[0].upper() if words else "UNKNOWN"
+
+
+def instrument_engine(engine: AsyncEngine, name: str) -> None:
+    """
+    Замер SQL-запросов движка через события курсора
+    """
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, *args) -> None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, *args) -> None:
+        start = conn.info["query_start"].pop()
+        SQL_QUERY_SECONDS.labels(name, sql_operation(statement)).observe(
+            time.perf_counter() - start
+        )
+
+    @event.listens_for(sync_engine, "handle_error")
+    def handle_error(context) -> None:
+        conn = context.connection
+        if conn is not None and conn.info.get("query_start"):
+            conn.info["query_start"].pop()
+        SQL_QUERY_ERRORS.labels(name, sql_operation(context.statement)).inc()
+
+
+@contextmanager
+def redis_timer(command: str):
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        REDIS_COMMAND_ERRORS.labels(command).inc()
+        raise
+    finally:
+        REDIS_COMMAND_SECONDS.labels(command).observe(time.perf_counter() - start)
+
+
+@contextmanager
+def token_verify_timer():
+    start = time.perf_counter()
+    result = "invalid"
+    try:
+        yield
+        result = "valid"
+    finally:
+        TOKEN_VERIFY_SECONDS.labels(result).observe(time.perf_counter() - start)
@@ -0,0 +1,85 @@
+from typing import Sequence
+
+import orjson
+from fastapi import Request, Response, status
+from sqlalchemy import Row
+
+from src.services.item_cache import CachedItem
+from src.services.movies_client import expand_movies
+from src.services.page_cache import CachedPage
+
+
+def encode_rows(rows: Sequence[Row], fields: Sequence[str]) -> bytes:
+    """
+    Строки из запроса по колонкам сразу в JSON, без ORM-объектов и pydantic
+    """
+    # default=str: asyncpg отдает UUID своим подклассом, orjson его не знает
+    return orjson.dumps([dict(zip(fields, row)) for row in rows], default=str)
+
+
+def rows_response(
+    rows: Sequence[Row], fields: Sequence[str], headers: dict | None = None
+) -> Response:
+    return Response(
+        content=encode_rows(rows, fields),
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+def page_response(page: CachedPage, headers: dict | None = None) -> Response:
+    headers = dict(headers or {})
+    if page.cursor:
+        headers["X-Next-Cursor"] = page.cursor
+    return Response(content=page.body, media_type="application/json", headers=headers)
+
+
+def item_response(item: CachedItem, request: Request) -> Response:
+    """
+    Закешированная запись с ETag; 304 без тела, если клиент прислал тот же ETag
+    """
+    headers = {"ETag": item.etag}
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match and (
+        if_none_match.strip() == "*"
+        or item.etag
+        in (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    ):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=item.body, media_type="application/json", headers=headers)
+
+
+def batch_response(
+    rows: Sequence[Row], fields: Sequence[str], missing: Sequence
+) -> Response:
+    return Response(
+        content=orjson.dumps(
+            {"items": [dict(zip(fields, row)) for row in rows], "missing": missing},
+            default=str,
+        ),
+        media_type="application/json",
+    )
+
+
+async def movie_expanded_response(
+    items: list[dict], request: Request, headers: dict | None = None
+) -> Response:
+    """
+    Комментарии со встроенным фильмом. Если movies не ответил вовремя, фильмы
+    не из кеша будут null, а в ответе появится X-Expand-Incomplete
+    """
+    headers = dict(headers or {})
+    if not await expand_movies(items, request.headers.get("Authorization")):
+        headers["X-Expand-Incomplete"] = "movie"
+    return Response(
+        content=orjson.dumps(items, default=str),
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+def total_headers(count: int, exact: bool) -> dict:
+    return {
+        "X-Total-Count": str(count),
+        "X-Total-Count-Exact": "true" if exact else "false",
+    }
@@ -0,0 +1,93 @@
+import asyncio
+import logging
+import time
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+
+class RevokedTokens:
+    """
+    Множество отозванных jti в памяти процесса, каждый живет до exp токена
+    """
+
+    def __init__(self) -> None:
+        self._items: dict[str, float] = {}
+
+    def add(self, jti: str, exp: float) -> None:
+        if exp > time.time():
+            self._items[jti] = exp
+
+    def is_revoked(self, payload: dict) -> bool:
+        if not self._items:
+            return False
+        for jti in (payload.get("jti_access"), payload.get("jti_refresh")):
+            exp = self._items.get(jti)
+            if exp is not None and exp > time.time():
+                return True
+        return False
+
+    def purge(self) -> None:
+        now = time.time()
+        for jti in [jti for jti, exp in self._items.items() if exp <= now]:
+            del self._items[jti]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class RevocationSubscriber:
+    """
+    Фоновое чтение потока отзывов сервиса auth.
+    При старте и после переподключения дочитывает пропущенные события
+    """
+
+    def __init__(
+        self,
+        revoked: RevokedTokens,
+        stream: str,
+        replay_seconds: int,
+        block_ms: int = 5000,
+        batch_size: int = 1000,
+        retry_seconds: float = 1.0,
+    ) -> None:
+        self._revoked = revoked
+        self._stream = stream
+        self._replay_seconds = replay_seconds
+        self._block_ms = block_ms
+        self._batch_size = batch_size
+        self._retry_seconds = retry_seconds
+        self.last_id: str | None = None
+
+    def _handle(self, entries: list) -> None:
+        for entry_id, fields in entries:
+            self.last_id = entry_id
+            try:
+                self._revoked.add(fields[b"jti"].decode(), float(fields[b"exp"]))
+            except (KeyError, ValueError):
+                logger.warning("Skip malformed revocation event %s", entry_id)
+
+    async def run(self, redis: Redis) -> None:
+        if self.last_id is None:
+            replay_from = int((time.time() - self._replay_seconds) * 1000)
+            self.last_id = f"{replay_from}-0"
+        while True:
+            try:
+                response = await redis.xread(
+                    {self._stream: self.last_id},
+                    count=self._batch_size,
+                    block=self._block_ms,
+                )
+            except asyncio.CancelledError:
+                raise
+            except RedisError:
+                logger.warning(
+                    "Revocation stream is unavailable, retry from %s", self.last_id
+                )
+                await asyncio.sleep(self._retry_seconds)
+                continue
+            for _, entries in response:
+                self._handle(entries)
+            self._revoked.purge()
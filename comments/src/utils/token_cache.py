@@ -0,0 +1,45 @@
+import hashlib
+import time
+from collections import OrderedDict
+
+
+class VerifiedTokenCache:
+    """
+    LRU-кеш уже проверенных токенов: sha256(token) -> claims до истечения exp
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self._maxsize = maxsize
+        self._items: OrderedDict[bytes, dict] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def digest(token: str | bytes) -> bytes:
+        if isinstance(token, str):
+            token = token.encode("utf-8")
+        return hashlib.sha256(token).digest()
+
+    def get(self, key: bytes) -> dict | None:
+        claims = self._items.get(key)
+        if claims is None:
+            self.misses += 1
+            return None
+        if claims["exp"] <= time.time():
+            del self._items[key]
+            self.misses += 1
+            return None
+        self._items.move_to_end(key)
+        self.hits += 1
+        return claims
+
+    def put(self, key: bytes, claims: dict) -> None:
+        if self._maxsize <= 0 or not isinstance(claims.get("exp"), (int, float)):
+            return
+        self._items[key] = claims
+        self._items.move_to_end(key)
+        while len(self._items) > self._maxsize:
+            self._items.popitem(last=False)
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._items)}
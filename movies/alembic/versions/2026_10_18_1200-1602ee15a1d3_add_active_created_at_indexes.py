@@ -0,0 +1,53 @@
+"""add active created_at indexes
+
+Revision ID: 1602ee15a1d3
+Revises: 4973d68236e1
+Create Date: 2026-10-18 12:00:41.517306
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "1602ee15a1d3"
+down_revision: Union[str, None] = "4973d68236e1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_movies_active_created_at_id",
+            "movies",
+            ["created_at", "id"],
+            unique=False,
+            postgresql_where=sa.text("deleted_at IS NULL"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_movies_active_user_id_created_at_id",
+            "movies",
+            ["user_id", "created_at", "id"],
+            unique=False,
+            postgresql_where=sa.text("deleted_at IS NULL"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_movies_active_user_id_created_at_id",
+            table_name="movies",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_movies_active_created_at_id",
+            table_name="movies",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,76 @@
+"""add movies search
+
+Revision ID: 5be1f0c7d9a2
+Revises: 1602ee15a1d3
+Create Date: 2026-10-18 15:00:12.408517
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5be1f0c7d9a2"
+down_revision: Union[str, None] = "1602ee15a1d3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('russian', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('russian', coalesce(description, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Хранимая генерируемая колонка: таблица переписывается один раз под блокировкой
+    op.add_column(
+        "movies",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(SEARCH_VECTOR, persisted=True),
+            nullable=True,
+        ),
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_movies_active_search_vector",
+            "movies",
+            ["search_vector"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_where=sa.text("deleted_at IS NULL"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_movies_active_name_trgm",
+            "movies",
+            ["name"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+            postgresql_where=sa.text("deleted_at IS NULL"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_movies_active_name_trgm",
+            table_name="movies",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_movies_active_search_vector",
+            table_name="movies",
+            postgresql_concurrently=True,
+        )
+    op.drop_column("movies", "search_vector")
@@ -0,0 +1,148 @@
+"""
+Проверка планов горячих запросов: наполняет базу тестовыми данными внутри
+транзакции, прогоняет EXPLAIN для запросов crud и откатывает транзакцию.
+Завершается с кодом 1, если какой-то запрос читает горячую таблицу через Seq Scan.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from random import Random
+from uuid import uuid4
+
+from sqlalchemy import event, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.session import db_session
+from src.models.movies import Movie
+from src.services.crud.movies import crud_movies, user_movies
+from src.utils.pagination import encode_cursor
+
+HOT_TABLES = frozenset({"movies"})
+
+
+@contextmanager
+def captured_statements():
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    engine = db_session.engine.sync_engine
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+
+def scans(plan: dict) -> list[tuple[str, str, str | None]]:
+    found = []
+    if "Relation Name" in plan:
+        found.append((plan["Node Type"], plan["Relation Name"], plan.get("Index Name")))
+    for child in plan.get("Plans", []):
+        found.extend(scans(child))
+    return found
+
+
+async def explain(session: AsyncSession, statement: str, parameters) -> dict:
+    conn = await session.connection()
+    result = await conn.exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {statement}", parameters
+    )
+    plan = result.scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+async def seed(session: AsyncSession, rows: int, users: int) -> Movie:
+    rng = Random(0)
+    user_ids = [uuid4() for _ in range(users)]
+    start = datetime.now(timezone.utc) - timedelta(days=365)
+    await session.execute(
+        insert(Movie),
+        [
+            {
+                "id": uuid4(),
+                "name": f"movie {i}",
+                "description": "description",
+                "user_id": rng.choice(user_ids),
+                "created_at": start + timedelta(seconds=rng.randrange(365 * 86400)),
+                "deleted_at": start if rng.random() < 0.1 else None,
+            }
+            for i in range(rows)
+        ],
+    )
+    await session.execute(text("ANALYZE movies"))
+    return await session.scalar(
+        select(Movie)
+        .where(Movie.deleted_at.is_(None))
+        .order_by(Movie.created_at)
+        .offset(rows // 2)
+        .limit(1)
+    )
+
+
+def hot_queries(session: AsyncSession, sample: Movie) -> dict:
+    cursor = encode_cursor(sample.created_at, sample.id)
+    return {
+        "crud_movies.get (page)": lambda: crud_movies.get(
+            session, page_size=20, page_number=50
+        ),
+        "crud_movies.get (cursor)": lambda: crud_movies.get(
+            session, page_size=20, after=cursor
+        ),
+        "crud_movies.get_many": lambda: crud_movies.get_many(
+            session, ids=[sample.id], fields=("id", "name")
+        ),
+        "crud_movies.get_by_id": lambda: crud_movies.get_by_id(session, id_=sample.id),
+        "user_movies (page)": lambda: user_movies(
+            sample.user_id, session, page_size=20, page_number=2
+        ),
+        "user_movies (cursor)": lambda: user_movies(
+            sample.user_id, session, page_size=20, after=cursor
+        ),
+        "crud_movies.search": lambda: crud_movies.search(
+            session, query=sample.name, fields=("id", "name"), page_size=20
+        ),
+        "crud_movies.autocomplete": lambda: crud_movies.autocomplete(
+            session, prefix=sample.name, fields=("id", "name"), page_size=10
+        ),
+    }
+
+
+async def main(rows: int, users: int) -> int:
+    failed = 0
+    async with db_session.session_factory() as session:
+        try:
+            sample = await seed(session, rows=rows, users=users)
+            for name, query in hot_queries(session, sample).items():
+                with captured_statements() as statements:
+                    await query()
+                for statement, parameters in statements:
+                    plan = await explain(session, statement, parameters)
+                    for node, relation, index in scans(plan):
+                        is_seq_scan = node == "Seq Scan" and relation in HOT_TABLES
+                        print(
+                            f"{'FAIL' if is_seq_scan else 'ok':4} {name}: "
+                            f"{node} on {relation}"
+                            + (f" using {index}" if index else "")
+                        )
+                        failed += is_seq_scan
+        finally:
+            await session.rollback()
+    await db_session.engine.dispose()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--users", type=int, default=1_000)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(rows=args.rows, users=args.users)))
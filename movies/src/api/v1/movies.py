@@ -7,19 +7,34 @@ from src.schemas.movies import (
     UpdateMovieSchema,
     PartialUpdateMovieSchema,
     ShowMovieSchema,
+    BulkUpdateMovieSchema,
+    BatchMoviesSchema,
+    MovieSuggestionSchema,
 )
 from sqlalchemy.ext.asyncio import AsyncSession
-from fastapi import APIRouter, Depends, Response, status, Query, Request
+from fastapi import APIRouter, Body, Depends, Response, status, Query, Request
 
+from src.core.settings import settings
+from src.schemas.base import BulkResultSchema
 from src.schemas.users import UserSchema
 from src.services.crud.movies import crud_movies, user_movies
 from src.db.session import db_session
 from src.utils.auth_utils import auth_utils
-from src.utils.check_permissions import check_permissions
+from src.utils.check_permissions import check_permissions, require_permissions
+from src.utils.pagination import next_cursor
+from src.utils.responses import (
+    batch_response,
+    item_response,
+    rows_response,
+    total_headers,
+)
 
 
 router = APIRouter()
 
+SHOW_FIELDS = tuple(ShowMovieSchema.model_fields)
+SUGGESTION_FIELDS = tuple(MovieSuggestionSchema.model_fields)
+
 
 @router.post(
     "/",
@@ -55,13 +70,28 @@ async def get_movies(
         ge=1, le=100, description="Количество элементов на странице", default=1
     ),
     page_number: int = Query(ge=1, description="Номер страницы", default=1),
+    after: str | None = Query(
+        description="Курсор следующей страницы из заголовка X-Next-Cursor",
+        default=None,
+    ),
+    with_total: bool = Query(
+        description="Вернуть X-Total-Count: точный или оценку (X-Total-Count-Exact)",
+        default=False,
+    ),
     session: AsyncSession = Depends(db_session.get_session),
-) -> list[ShowMovieSchema]:
-    return await crud_movies.get(
+) -> Response:
+    rows = await crud_movies.get_rows(
         session=session,
+        fields=SHOW_FIELDS,
         page_size=page_size,
         page_number=page_number,
+        after=after,
     )
+    cursor = next_cursor(rows, page_size)
+    headers = {"X-Next-Cursor": cursor} if cursor else {}
+    if with_total:
+        headers.update(total_headers(*await crud_movies.count(session)))
+    return rows_response(rows, SHOW_FIELDS, headers=headers)
 
 
 @router.get(
@@ -73,21 +103,167 @@ async def get_movies(
 @check_permissions(["user"])
 async def get_user_movies(
     request: Request,
+    response: Response,
     user_id: UUID,
     session: AsyncSession = Depends(db_session.get_session),
     page_size: int = Query(
         ge=1, le=100, description="Количество элементов на странице", default=1
     ),
     page_number: int = Query(ge=1, description="Номер страницы", default=1),
+    after: str | None = Query(
+        description="Курсор следующей страницы из заголовка X-Next-Cursor",
+        default=None,
+    ),
+    with_total: bool = Query(
+        description="Вернуть X-Total-Count: точный или оценку (X-Total-Count-Exact)",
+        default=False,
+    ),
 ) -> list[Movie]:
-    return await user_movies(
+    items = await user_movies(
         session=session,
         user_id=user_id,
         page_size=page_size,
         page_number=page_number,
+        after=after,
+    )
+    cursor = next_cursor(items, page_size)
+    if cursor:
+        response.headers["X-Next-Cursor"] = cursor
+    if with_total:
+        total = await crud_movies.count(session, filters=[Movie.user_id == user_id])
+        response.headers.update(total_headers(*total))
+    return items
+
+
+@router.get(
+    "/search",
+    response_model=list[ShowMovieSchema],
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(auth_utils.get_current_user)],
+)
+@check_permissions(["user"])
+async def search_movies(
+    request: Request,
+    q: str = Query(min_length=1, max_length=200, description="Поисковый запрос"),
+    page_size: int = Query(
+        ge=1, le=100, description="Количество элементов на странице", default=20
+    ),
+    page_number: int = Query(ge=1, le=50, description="Номер страницы", default=1),
+    with_total: bool = Query(
+        description="Вернуть X-Total-Count: точный или оценку (X-Total-Count-Exact)",
+        default=False,
+    ),
+    session: AsyncSession = Depends(db_session.get_session),
+) -> Response:
+    rows = await crud_movies.search(
+        session=session,
+        query=q,
+        fields=SHOW_FIELDS,
+        page_size=page_size,
+        page_number=page_number,
+    )
+    headers = None
+    if with_total:
+        headers = total_headers(*await crud_movies.search_count(session, query=q))
+    return rows_response(rows, SHOW_FIELDS, headers=headers)
+
+
+@router.get(
+    "/autocomplete",
+    response_model=list[MovieSuggestionSchema],
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(auth_utils.get_current_user)],
+)
+@check_permissions(["user"])
+async def autocomplete_movies(
+    request: Request,
+    q: str = Query(min_length=3, max_length=100, description="Начало названия фильма"),
+    page_size: int = Query(
+        ge=1, le=50, description="Количество элементов на странице", default=10
+    ),
+    page_number: int = Query(ge=1, le=10, description="Номер страницы", default=1),
+    session: AsyncSession = Depends(db_session.get_session),
+) -> Response:
+    rows = await crud_movies.autocomplete(
+        session=session,
+        prefix=q,
+        fields=SUGGESTION_FIELDS,
+        page_size=page_size,
+        page_number=page_number,
+    )
+    return rows_response(rows, SUGGESTION_FIELDS)
+
+
+@router.post(
+    "/batch",
+    response_model=BatchMoviesSchema,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(auth_utils.get_current_user)],
+)
+@check_permissions(["user"])
+async def get_movies_batch(
+    request: Request,
+    movie_ids: list[UUID] = Body(min_length=1, max_length=settings.BATCH_MAX_ITEMS),
+    session: AsyncSession = Depends(db_session.get_read_session),
+) -> Response:
+    rows, missing = await crud_movies.get_many(
+        session=session, ids=movie_ids, fields=SHOW_FIELDS
+    )
+    return batch_response(rows, SHOW_FIELDS, missing)
+
+
+@router.post(
+    "/bulk",
+    response_model=list[BulkResultSchema],
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(require_permissions("movies.bulk"))],
+)
+async def bulk_create_movies(
+    movies_schema: list[CreateMovieSchema] = Body(
+        min_length=1, max_length=settings.BULK_MAX_ITEMS
+    ),
+    user: UserSchema = Depends(auth_utils.get_current_user),
+    session: AsyncSession = Depends(db_session.get_session),
+) -> list[BulkResultSchema]:
+    return await crud_movies.bulk_create(
+        session=session,
+        objs_schema=[
+            CreateMovieWithUserIDSchema(
+                **movie_schema.model_dump(), user_id=user.user_id
+            )
+            for movie_schema in movies_schema
+        ],
     )
 
 
+@router.patch(
+    "/bulk",
+    response_model=list[BulkResultSchema],
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(require_permissions("movies.bulk"))],
+)
+async def bulk_update_movies(
+    movies_schema: list[BulkUpdateMovieSchema] = Body(
+        min_length=1, max_length=settings.BULK_MAX_ITEMS
+    ),
+    session: AsyncSession = Depends(db_session.get_session),
+) -> list[BulkResultSchema]:
+    return await crud_movies.bulk_update(session=session, objs_schema=movies_schema)
+
+
+@router.delete(
+    "/bulk",
+    response_model=list[BulkResultSchema],
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(require_permissions("movies.bulk"))],
+)
+async def bulk_delete_movies(
+    movie_ids: list[UUID] = Body(min_length=1, max_length=settings.BULK_MAX_ITEMS),
+    session: AsyncSession = Depends(db_session.get_session),
+) -> list[BulkResultSchema]:
+    return await crud_movies.bulk_delete(session=session, ids=movie_ids)
+
+
 @router.get(
     "/{movie_id}",
     response_model=ShowMovieSchema,
@@ -99,8 +275,11 @@ async def get_movie(
     request: Request,
     movie_id: UUID,
     session: AsyncSession = Depends(db_session.get_session),
-) -> ShowMovieSchema:
-    return await crud_movies.get_by_id(session=session, id_=movie_id)
+) -> Response:
+    item = await crud_movies.get_by_id_cached(
+        session=session, id_=movie_id, fields=SHOW_FIELDS
+    )
+    return item_response(item, request)
 
 
 @router.put(
@@ -114,12 +293,14 @@ async def update_movie(
     request: Request,
     movie_id: UUID,
     movie_schema: UpdateMovieSchema,
+    user: UserSchema = Depends(auth_utils.get_current_user),
     session: AsyncSession = Depends(db_session.get_session),
 ) -> ShowMovieSchema:
     return await crud_movies.update(
         session=session,
         obj_schema=movie_schema,
         id_=movie_id,
+        owner_id=user.user_id,
     )
 
 
@@ -134,6 +315,7 @@ async def particular_update_movie(
     request: Request,
     movie_id: UUID,
     movie_schema: PartialUpdateMovieSchema,
+    user: UserSchema = Depends(auth_utils.get_current_user),
     session: AsyncSession = Depends(db_session.get_session),
 ) -> ShowMovieSchema:
     return await crud_movies.update(
@@ -141,6 +323,7 @@ async def particular_update_movie(
         obj_schema=movie_schema,
         id_=movie_id,
         particular=True,
+        owner_id=user.user_id,
     )
 
 
@@ -153,7 +336,8 @@ async def particular_update_movie(
 async def delete_movie(
     request: Request,
     movie_id: UUID,
+    user: UserSchema = Depends(auth_utils.get_current_user),
     session: AsyncSession = Depends(db_session.get_session),
 ) -> Response:
-    await crud_movies.delete(session=session, id_=movie_id)
+    await crud_movies.delete(session=session, id_=movie_id, owner_id=user.user_id)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
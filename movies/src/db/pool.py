@@ -0,0 +1,65 @@
+import time
+from bisect import bisect_left
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+class PoolStats:
+    """
+    Гистограмма времени ожидания соединения из пула (границы в секундах)
+    и число отказов по pool_timeout
+    """
+
+    BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+    def __init__(self) -> None:
+        self.wait_counts = [0] * (len(self.BUCKETS) + 1)
+        self.wait_sum = 0.0
+        self.timeouts = 0
+
+    def observe_wait(self, seconds: float) -> None:
+        self.wait_counts[bisect_left(self.BUCKETS, seconds)] += 1
+        self.wait_sum += seconds
+
+    def snapshot(self, pool: AsyncAdaptedQueuePool) -> dict:
+        buckets, total = {}, 0
+        for bound, count in zip((*self.BUCKETS, "+Inf"), self.wait_counts):
+            total += count
+            buckets[str(bound)] = total
+        return {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": pool._max_overflow,
+            "timeouts": self.timeouts,
+            "wait_seconds": {"count": total, "sum": self.wait_sum, "buckets": buckets},
+        }
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool, который замеряет время выдачи соединения:
+    ожидание свободного слота, открытие нового соединения и pre-ping
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.stats.timeouts += 1
+            raise
+        finally:
+            self.stats.observe_wait(time.perf_counter() - start)
+
+    def recreate(self) -> "InstrumentedPool":
+        # engine.dispose() пересоздает пул, статистика переходит в новый
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
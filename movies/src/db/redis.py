@@ -0,0 +1,69 @@
+from redis.asyncio import Redis
+from abc import ABC, abstractmethod
+
+from src.utils.metrics import redis_timer
+
+redis: Redis | None = None
+
+
+class AbstractCache(ABC):
+
+    @abstractmethod
+    def __init__(self):
+        pass
+
+    @abstractmethod
+    async def get(self, key: str) -> str:
+        """
+        Забрать данные из кеша по ключу
+        """
+        pass
+
+    @abstractmethod
+    async def mget(self, keys: list[str | bytes]) -> list[str | None]:
+        """
+        Забрать данные из кеша по нескольким ключам за один запрос
+        """
+        pass
+
+    @abstractmethod
+    async def put(self, key: str, value: str, cache_time: int = None):
+        """
+        Положить данные в кеш по ключу с временем жизни
+        """
+        pass
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> set:
+        """
+        Удаляет по ключам объекты из кеша
+        """
+        pass
+
+
+class RedisCache(AbstractCache):
+    def __init__(self, cache):
+        self.cache = cache
+
+    async def get(self, key: str) -> str:
+        with redis_timer("get"):
+            return await self.cache.get(key)
+
+    async def mget(self, keys: list[str | bytes]) -> list[str | None]:
+        with redis_timer("mget"):
+            return await self.cache.mget(keys)
+
+    async def put(self, key: str, value: str, cache_time: int = None):
+        with redis_timer("put"):
+            return await self.cache.set(key, value, cache_time)
+
+    async def delete(self, *keys: str):
+        with redis_timer("delete"):
+            await self.cache.delete(*keys)
+
+    async def close(self):
+        await self.cache.close()
+
+
+async def get_redis() -> RedisCache:
+    return RedisCache(redis)
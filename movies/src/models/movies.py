@@ -1,14 +1,54 @@
 from uuid import UUID
 
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import String, Text, Integer
-from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy import String, Text, Integer, Index, Computed, text
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID as PG_UUID
 from src.models.base import IdCUDMixin
 
+# Конфигурации полнотекстового поиска: стемминг русского и английского
+SEARCH_CONFIGS = ("russian", "english")
+
+SEARCH_VECTOR = " || ".join(
+    f"setweight(to_tsvector('{config}', coalesce({field}, '')), '{weight}')"
+    for field, weight in (("name", "A"), ("description", "B"))
+    for config in SEARCH_CONFIGS
+)
+
 
 class Movie(IdCUDMixin):
     __tablename__ = "movies"
+    __table_args__ = (
+        Index(
+            "ix_movies_active_created_at_id",
+            "created_at",
+            "id",
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        Index(
+            "ix_movies_active_user_id_created_at_id",
+            "user_id",
+            "created_at",
+            "id",
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        Index(
+            "ix_movies_active_search_vector",
+            "search_vector",
+            postgresql_using="gin",
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        Index(
+            "ix_movies_active_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+    )
 
     name: Mapped[str] = mapped_column(String(255))
     description: Mapped[UUID] = mapped_column(Text)
     user_id: Mapped[int] = mapped_column(PG_UUID(as_uuid=True))
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR, Computed(SEARCH_VECTOR, persisted=True), deferred=True
+    )
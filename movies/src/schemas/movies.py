@@ -1,5 +1,7 @@
 from uuid import UUID
 
+from pydantic import field_validator
+
 from src.schemas.base import BaseSchema
 
 
@@ -28,3 +30,28 @@ class UpdateMovieSchema(MovieSchema):
 class PartialUpdateMovieSchema(MovieSchema):
     name: str | None = None
     description: str | None = None
+
+
+class BulkUpdateMovieSchema(PartialUpdateMovieSchema):
+    id: UUID
+
+    @field_validator("name", "description")
+    @classmethod
+    def not_null(cls, value):
+        """
+        null не отличить от пропуска в UPDATE ... FROM (VALUES ...): чтобы
+        оставить поле как есть, его нужно не передавать
+        """
+        if value is None:
+            raise ValueError("null is not allowed, omit the field instead")
+        return value
+
+
+class MovieSuggestionSchema(BaseSchema):
+    id: UUID
+    name: str
+
+
+class BatchMoviesSchema(BaseSchema):
+    items: list[ShowMovieSchema]
+    missing: list[UUID]
@@ -1,13 +1,30 @@
 from abc import ABC, abstractmethod
-from datetime import datetime, timezone
-from typing import Type
+from functools import partial
+from typing import Sequence, Type
 from uuid import UUID
 
-from sqlalchemy import Select
+import orjson
+from fastapi import status
+from sqlalchemy import (
+    Row,
+    Select,
+    any_,
+    bindparam,
+    cast,
+    column,
+    func,
+    insert,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.db.session import db_session
 from src.models.base import Base
-from src.schemas.base import BaseSchema
+from src.schemas.base import BaseSchema, BulkResultSchema
+from src.services.item_cache import CachedItem, ItemCache
+from src.utils.pagination import Total, count_total, paginate
 from src.utils.raising_http_excp import RaiseHttpException
 
 
@@ -40,8 +57,9 @@ class ModelManager[
     PUT: BaseSchema,
     PATCH: BaseSchema,
 ](ABCModelManager):
-    def __init__(self, model: Type[Model]):
+    def __init__(self, model: Type[Model], cache: ItemCache | None = None):
         self._model = model
+        self._cache = cache
 
     async def get_by_id(
         self, session: AsyncSession, id_: int | UUID, *args, **kwargs
@@ -55,32 +73,131 @@ class ModelManager[
         RaiseHttpException.check_is_exist(result)
         return result
 
+    async def get_by_id_cached(
+        self, session: AsyncSession, id_: int | UUID, fields: Sequence[str]
+    ) -> CachedItem:
+        """
+        get_by_id через кеш: готовое JSON-тело по полям fields и ETag из updated_at
+        """
+        table = self._model.__tablename__
+        if self._cache is not None:
+            item = await self._cache.get(table, id_)
+            if item is not None:
+                return item
+        result = await session.execute(
+            Select(
+                *(getattr(self._model, field) for field in fields),
+                self._model.updated_at,
+            ).where(
+                self._model.id == id_,
+                self._model.deleted_at.is_(None),
+            )
+        )
+        row = result.first()
+        RaiseHttpException.check_is_exist(row)
+        item = CachedItem.build(
+            body=orjson.dumps(dict(zip(fields, row)), default=str),
+            updated_at=row.updated_at,
+        )
+        if self._cache is not None:
+            await self._cache.put(table, id_, item)
+        return item
+
+    async def get_many(
+        self, session: AsyncSession, ids: Sequence[int | UUID], fields: Sequence[str]
+    ) -> tuple[list[Row], list[int | UUID]]:
+        """
+        Активные строки по списку id одним запросом id = ANY(:ids) в порядке ids
+        и список id, которых нет
+        """
+        ids = list(dict.fromkeys(ids))
+        columns = [getattr(self._model, field) for field in fields]
+        if "id" not in fields:
+            columns.append(self._model.id)
+        result = await session.execute(
+            Select(*columns).where(
+                self._model.id
+                == any_(bindparam("ids", ids, type_=ARRAY(self._model.id.type))),
+                self._model.deleted_at.is_(None),
+            )
+        )
+        found = {row.id: row for row in result}
+        return (
+            [found[id_] for id_ in ids if id_ in found],
+            [id_ for id_ in ids if id_ not in found],
+        )
+
     async def get(
         self,
         session: AsyncSession,
         page_size: int,
-        page_number: int,
+        page_number: int = 1,
+        after: str | None = None,
         *args,
         **kwargs,
     ) -> list[GET | None]:
-        page_from = page_size * (page_number - 1)
         result = await session.scalars(
-            Select(self._model)
-            .where(
-                self._model.deleted_at.is_(None),
+            paginate(
+                Select(self._model).where(
+                    self._model.deleted_at.is_(None),
+                ),
+                model=self._model,
+                page_size=page_size,
+                page_number=page_number,
+                after=after,
+            )
+        )
+        return list(result)
+
+    async def get_rows(
+        self,
+        session: AsyncSession,
+        fields: Sequence[str],
+        page_size: int,
+        page_number: int = 1,
+        after: str | None = None,
+        *args,
+        **kwargs,
+    ) -> list[Row]:
+        """
+        Как get, но только колонки fields (плюс created_at и id для курсора)
+        без ORM-объектов и identity map
+        """
+        columns = [getattr(self._model, field) for field in fields]
+        columns += [
+            column_
+            for column_ in (self._model.created_at, self._model.id)
+            if column_.key not in fields
+        ]
+        result = await session.execute(
+            paginate(
+                Select(*columns).where(self._model.deleted_at.is_(None)),
+                model=self._model,
+                page_size=page_size,
+                page_number=page_number,
+                after=after,
             )
-            .offset(page_from)
-            .limit(page_size)
         )
         return list(result)
 
+    async def count(self, session: AsyncSession, filters: Sequence = ()) -> Total:
+        """
+        Число активных строк: точное до TOTAL_COUNT_CAP, дальше оценка
+        """
+        return await count_total(
+            session,
+            Select(self._model.id).where(self._model.deleted_at.is_(None), *filters),
+        )
+
     async def create(
         self, session: AsyncSession, obj_schema: POST, *args, **kwargs
     ) -> GET:
-        item = self._model(**obj_schema.model_dump())
-        session.add(item)
+        item = await session.scalar(
+            insert(self._model)
+            .values(**obj_schema.model_dump())
+            .returning(self._model)
+        )
         await session.commit()
-        await session.refresh(item)
         return item
 
     async def update(
@@ -89,16 +206,154 @@ class ModelManager[
         id_: int | UUID,
         obj_schema: PUT | PATCH,
         particular: bool = False,
+        owner_id: UUID | None = None,
         *args,
         **kwargs,
-    ):
-        item = await self.get_by_id(session, id_=id_)
-        for key, value in obj_schema.model_dump(exclude_unset=particular).items():
-            setattr(item, key, value)
+    ) -> GET:
+        item = await session.scalar(
+            update(self._model)
+            .where(*self._writable(id_, owner_id))
+            .values(
+                {
+                    **obj_schema.model_dump(exclude_unset=particular),
+                    "updated_at": func.now(),
+                }
+            )
+            .returning(self._model)
+            .execution_options(synchronize_session=False)
+        )
+        RaiseHttpException.check_is_exist(item)
         await session.commit()
+        await self._invalidate(id_)
         return item
 
-    async def delete(self, session: AsyncSession, id_: int | UUID, *args, **kwargs):
-        item = await self.get_by_id(session, id_=id_)
-        item.deleted_at = datetime.now(timezone.utc)
+    async def delete(
+        self,
+        session: AsyncSession,
+        id_: int | UUID,
+        owner_id: UUID | None = None,
+        *args,
+        **kwargs,
+    ) -> None:
+        deleted_id = await session.scalar(
+            update(self._model)
+            .where(*self._writable(id_, owner_id))
+            .values(deleted_at=func.now())
+            .returning(self._model.id)
+            .execution_options(synchronize_session=False)
+        )
+        RaiseHttpException.check_is_exist(deleted_id)
+        await session.commit()
+        await self._invalidate(id_)
+
+    async def _invalidate(self, *ids: int | UUID) -> None:
+        await self._drop_cached(*ids)
+        # чтение до коммита или с отстающей реплики могло вернуть в кеш старую версию
+        db_session.after_replication(partial(self._drop_cached, *ids))
+
+    async def _drop_cached(self, *ids: int | UUID) -> None:
+        if self._cache is not None:
+            await self._cache.invalidate(self._model.__tablename__, *ids)
+
+    def _writable(self, id_: int | UUID, owner_id: UUID | None) -> list:
+        """
+        Условия на живую запись; с owner_id - только запись этого пользователя
+        """
+        criteria = [self._model.id == id_, self._model.deleted_at.is_(None)]
+        if owner_id is not None:
+            criteria.append(self._model.user_id == owner_id)
+        return criteria
+
+    async def bulk_create(
+        self, session: AsyncSession, objs_schema: list[POST], *args, **kwargs
+    ) -> list[BulkResultSchema]:
+        ids = await session.scalars(
+            insert(self._model).returning(
+                self._model.id, sort_by_parameter_order=True
+            ),
+            [obj_schema.model_dump() for obj_schema in objs_schema],
+        )
+        await session.commit()
+        return [
+            BulkResultSchema(id=id_, status=status.HTTP_201_CREATED) for id_ in ids
+        ]
+
+    async def bulk_update(
+        self,
+        session: AsyncSession,
+        objs_schema: list[PATCH],
+        *args,
+        **kwargs,
+    ) -> list[BulkResultSchema]:
+        """
+        Одним UPDATE ... FROM (VALUES ...); не переданные поля не меняются
+        """
+        rows = {}
+        for obj_schema in objs_schema:
+            rows[obj_schema.id] = obj_schema.model_dump(
+                exclude_unset=True, exclude_none=True
+            )
+        fields = sorted({key for row in rows.values() for key in row} - {"id"})
+        table = self._model.__table__
+        columns = ["id", *fields]
+        bulk = values(
+            *(column(name, table.c[name].type) for name in columns), name="bulk"
+        ).data([tuple(row.get(name) for name in columns) for row in rows.values()])
+        updated = set(
+            await session.scalars(
+                update(self._model)
+                .where(
+                    self._model.id == bulk.c.id,
+                    self._model.deleted_at.is_(None),
+                )
+                .values(
+                    {
+                        **{
+                            name: func.coalesce(
+                                cast(bulk.c[name], table.c[name].type), table.c[name]
+                            )
+                            for name in fields
+                        },
+                        "updated_at": func.now(),
+                    }
+                )
+                .returning(self._model.id)
+                .execution_options(synchronize_session=False)
+            )
+        )
         await session.commit()
+        await self._invalidate(*updated)
+        return self._bulk_results(
+            [obj_schema.id for obj_schema in objs_schema], updated, status.HTTP_200_OK
+        )
+
+    async def bulk_delete(
+        self, session: AsyncSession, ids: list[int | UUID], *args, **kwargs
+    ) -> list[BulkResultSchema]:
+        deleted = set(
+            await session.scalars(
+                update(self._model)
+                .where(
+                    self._model.id.in_(ids),
+                    self._model.deleted_at.is_(None),
+                )
+                .values(deleted_at=func.now())
+                .returning(self._model.id)
+                .execution_options(synchronize_session=False)
+            )
+        )
+        await session.commit()
+        await self._invalidate(*deleted)
+        return self._bulk_results(ids, deleted, status.HTTP_204_NO_CONTENT)
+
+    @staticmethod
+    def _bulk_results(
+        ids: list[int | UUID], matched: set, success_status: int
+    ) -> list[BulkResultSchema]:
+        return [
+            BulkResultSchema(
+                id=id_,
+                status=success_status if id_ in matched else status.HTTP_404_NOT_FOUND,
+            )
+            for id_ in ids
+        ]
@@ -1,6 +1,8 @@
+from functools import reduce
+from typing import Sequence
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import ColumnElement, Row, func, literal_column, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.schemas.movies import (
@@ -10,7 +12,9 @@ from src.schemas.movies import (
     PartialUpdateMovieSchema,
 )
 from src.services.crud.base import ModelManager
-from src.models.movies import Movie
+from src.services.item_cache import item_cache
+from src.models.movies import Movie, SEARCH_CONFIGS
+from src.utils.pagination import Total, paginate
 
 
 class MoviesManager(
@@ -22,20 +26,92 @@ class MoviesManager(
         PartialUpdateMovieSchema,
     ]
 ):
-    pass
+    async def search(
+        self,
+        session: AsyncSession,
+        query: str,
+        fields: Sequence[str],
+        page_size: int,
+        page_number: int = 1,
+    ) -> list[Row]:
+        """
+        Полнотекстовый поиск по названию и описанию, сначала самые релевантные
+        """
+        tsquery = search_query(query)
+        result = await session.execute(
+            select(*(getattr(Movie, field) for field in fields))
+            .where(Movie.deleted_at.is_(None), Movie.search_vector.op("@@")(tsquery))
+            .order_by(
+                func.ts_rank_cd(Movie.search_vector, tsquery).desc(),
+                Movie.created_at.desc(),
+                Movie.id.desc(),
+            )
+            .limit(page_size)
+            .offset(page_size * (page_number - 1))
+        )
+        return list(result)
 
+    async def search_count(self, session: AsyncSession, query: str) -> Total:
+        return await self.count(
+            session, filters=[Movie.search_vector.op("@@")(search_query(query))]
+        )
 
-crud_movies = MoviesManager(Movie)
+    async def autocomplete(
+        self,
+        session: AsyncSession,
+        prefix: str,
+        fields: Sequence[str],
+        page_size: int,
+        page_number: int = 1,
+    ) -> list[Row]:
+        """
+        Названия, начинающиеся с prefix (без учета регистра), по триграммному
+        индексу; короткие и наиболее похожие названия первыми
+        """
+        pattern = prefix.replace("/", "//").replace("%", "/%").replace("_", "/_") + "%"
+        result = await session.execute(
+            select(*(getattr(Movie, field) for field in fields))
+            .where(
+                Movie.deleted_at.is_(None),
+                Movie.name.ilike(pattern, escape="/"),
+            )
+            .order_by(func.similarity(Movie.name, prefix).desc(), Movie.name, Movie.id)
+            .limit(page_size)
+            .offset(page_size * (page_number - 1))
+        )
+        return list(result)
+
+
+def search_query(query: str) -> ColumnElement:
+    """
+    websearch-запрос во всех конфигурациях SEARCH_CONFIGS, объединенный через ИЛИ
+    """
+    return reduce(
+        lambda left, right: left.op("||")(right),
+        (
+            func.websearch_to_tsquery(literal_column(f"'{config}'"), query)
+            for config in SEARCH_CONFIGS
+        ),
+    )
+
+
+crud_movies = MoviesManager(Movie, cache=item_cache)
 
 
 async def user_movies(
     user_id: UUID,
     session: AsyncSession,
     page_size: int,
-    page_number: int,
+    page_number: int = 1,
+    after: str | None = None,
 ) -> list[Movie]:
-    page_from = page_size * (page_number - 1)
     movies = await session.scalars(
-        select(Movie).where(Movie.user_id == user_id).offset(page_from).limit(page_size)
+        paginate(
+            select(Movie).where(Movie.user_id == user_id, Movie.deleted_at.is_(None)),
+            model=Movie,
+            page_size=page_size,
+            page_number=page_number,
+            after=after,
+        )
     )
     return list(movies)
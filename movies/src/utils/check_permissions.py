@@ -1,10 +1,18 @@
 from functools import wraps
-from fastapi import HTTPException, status, Request
+from fastapi import HTTPException, status, Request, Depends
+from fastapi.security import HTTPAuthorizationCredentials
 from typing import Callable
-from src.utils.auth_utils import jwt_utils
+from src.core.permissions_registry import (
+    PERMISSIONS_REGISTRY_VERSION,
+    PERMISSION_BITS,
+    compile_permissions,
+)
+from src.utils.auth_utils import jwt_utils, http_bearer
 
 
 def check_permissions(required_roles: list):
+    required_roles = frozenset(required_roles)
+
     def decorator(endpoint: Callable):
         @wraps(endpoint)
         async def wrapper(*args, **kwargs):
@@ -26,7 +34,7 @@ def check_permissions(required_roles: list):
             payload = jwt_utils.decode_token(token)
             user_roles = payload.get("roles")
 
-            if sum([role in user_roles for role in required_roles]) < 1:
+            if required_roles.isdisjoint(user_roles):
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail="Access forbidden: insufficient permissions",
@@ -37,3 +45,28 @@ def check_permissions(required_roles: list):
         return wrapper
 
     return decorator
+
+
+def require_permissions(*permissions: str):
+    unknown = set(permissions) - PERMISSION_BITS.keys()
+    if unknown:
+        raise ValueError(f"Unknown permissions: {', '.join(sorted(unknown))}")
+    required_mask = compile_permissions(permissions)
+
+    async def dependency(
+        token: HTTPAuthorizationCredentials = Depends(http_bearer),
+    ) -> dict:
+        payload = jwt_utils.decode_token(token.credentials)
+        if payload.get("pv") != PERMISSIONS_REGISTRY_VERSION:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token permissions are outdated, refresh the token",
+            )
+        if payload.get("perms", 0) & required_mask != required_mask:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Access forbidden: insufficient permissions",
+            )
+        return payload
+
+    return dependency
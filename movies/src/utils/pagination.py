@@ -0,0 +1,85 @@
+import base64
+from datetime import datetime
+from typing import NamedTuple
+from uuid import UUID
+
+import orjson
+from fastapi import HTTPException, status
+from sqlalchemy import Select, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.settings import settings
+from src.models.base import IdCUDMixin
+
+
+class Total(NamedTuple):
+    count: int
+    exact: bool
+
+
+def encode_cursor(created_at: datetime, id_: UUID) -> str:
+    raw = f"{created_at.isoformat()}|{id_}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, id_ = raw.split("|")
+        return datetime.fromisoformat(created_at), UUID(id_)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+
+
+def paginate(
+    stmt: Select,
+    model: type[IdCUDMixin],
+    page_size: int,
+    page_number: int = 1,
+    after: str | None = None,
+) -> Select:
+    """
+    Страница по (created_at, id): по курсору after или по номеру страницы
+    """
+    stmt = stmt.order_by(model.created_at, model.id).limit(page_size)
+    if after is None:
+        return stmt.offset(page_size * (page_number - 1))
+    created_at, id_ = decode_cursor(after)
+    return stmt.where(tuple_(model.created_at, model.id) > tuple_(created_at, id_))
+
+
+def next_cursor(items: list, page_size: int) -> str | None:
+    if len(items) < page_size:
+        return None
+    return encode_cursor(items[-1].created_at, items[-1].id)
+
+
+async def count_total(
+    session: AsyncSession, stmt: Select, cap: int = settings.TOTAL_COUNT_CAP
+) -> Total:
+    """
+    Точное число строк stmt, если их не больше cap; иначе оценка планировщика,
+    чтобы не сканировать всю таблицу на каждый запрос страницы
+    """
+    count = await session.scalar(
+        select(func.count()).select_from(stmt.order_by(None).limit(cap + 1).subquery())
+    )
+    if count <= cap:
+        return Total(count=count, exact=True)
+    return Total(count=max(await estimate_rows(session, stmt), count), exact=False)
+
+
+async def estimate_rows(session: AsyncSession, stmt: Select) -> int:
+    conn = await session.connection()
+    compiled = stmt.compile(dialect=conn.dialect)
+    params = compiled.construct_params()
+    result = await conn.exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {compiled}",
+        tuple(params[name] for name in compiled.positiontup),
+    )
+    plan = result.scalar_one()
+    if isinstance(plan, str):
+        plan = orjson.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
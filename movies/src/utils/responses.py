@@ -0,0 +1,55 @@
+from typing import Sequence
+
+import orjson
+from fastapi import Request, Response, status
+from sqlalchemy import Row
+
+from src.services.item_cache import CachedItem
+
+
+def rows_response(
+    rows: Sequence[Row], fields: Sequence[str], headers: dict | None = None
+) -> Response:
+    """
+    Строки из запроса по колонкам сразу в JSON, без ORM-объектов и pydantic
+    """
+    return Response(
+        # default=str: asyncpg отдает UUID своим подклассом, orjson его не знает
+        content=orjson.dumps([dict(zip(fields, row)) for row in rows], default=str),
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+def item_response(item: CachedItem, request: Request) -> Response:
+    """
+    Закешированная запись с ETag; 304 без тела, если клиент прислал тот же ETag
+    """
+    headers = {"ETag": item.etag}
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match and (
+        if_none_match.strip() == "*"
+        or item.etag
+        in (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    ):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=item.body, media_type="application/json", headers=headers)
+
+
+def batch_response(
+    rows: Sequence[Row], fields: Sequence[str], missing: Sequence
+) -> Response:
+    return Response(
+        content=orjson.dumps(
+            {"items": [dict(zip(fields, row)) for row in rows], "missing": missing},
+            default=str,
+        ),
+        media_type="application/json",
+    )
+
+
+def total_headers(count: int, exact: bool) -> dict:
+    return {
+        "X-Total-Count": str(count),
+        "X-Total-Count-Exact": "true" if exact else "false",
+    }